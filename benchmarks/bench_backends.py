@@ -0,0 +1,71 @@
+"""차트 백엔드별 서버 CPU 시간과 전송 크기 비교 (matplotlib PNG vs Altair/Vega-Lite 명세).
+
+    python benchmarks/bench_backends.py
+    python benchmarks/bench_backends.py --repeat 10
+
+다른 백엔드 버전이 있는 차트마다 기본 위젯 값으로
+- matplotlib: Figure 만들기 + PNG 저장 (figure_cache.render, st.image로 보내는 바이트)
+- vega:       Altair 차트 만들기 + JSON 명세 직렬화 (데이터 포함, 브라우저로 보내는 양의 상한)
+을 반복해 프로세스 CPU 시간(time.process_time) 중앙값과 출력 크기를 잰다.
+데이터 읽기와 import는 먼저 한 번 실행해 측정에서 뺀다.
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import matplotlib  # noqa: E402
+
+matplotlib.use('Agg')
+
+import charts  # noqa: E402
+import figure_cache  # noqa: E402
+import fonts  # noqa: E402
+
+
+def output_bytes(build, args):
+    if build.output == 'image':
+        return figure_cache.render(build(*args))
+    if build.output == 'vega':
+        return build(*args).to_json().encode()
+    raise ValueError(f'비교하지 않는 출력 종류: {build.output}')
+
+
+def measure(build, args, repeat):
+    value = output_bytes(build, args)
+    times = []
+    for _ in range(repeat):
+        start = time.process_time()
+        output_bytes(build, args)
+        times.append(time.process_time() - start)
+    return statistics.median(times), len(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='차트 백엔드별 서버 CPU 시간과 출력 크기')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    fonts.setup()
+    for backend in charts.base.BACKEND_MODULES:
+        charts.load_backend(backend)
+    print(f"{'chart':<24} {'backend':<11} {'cpu ms':>9} {'bytes':>9}")
+    for chart_id, build in charts.CHARTS.items():
+        if len(build.variants) < 2:
+            continue
+        chart_args = charts.states(build)[0]
+        rows = {backend: measure(variant, chart_args, args.repeat) for backend, variant in build.variants.items()}
+        for backend, (seconds, size) in rows.items():
+            print(f'{chart_id:<24} {backend:<11} {seconds * 1000:9.1f} {size:9d}')
+        base_seconds, base_size = rows[charts.base.DEFAULT_BACKEND]
+        for backend, (seconds, size) in rows.items():
+            if backend != charts.base.DEFAULT_BACKEND:
+                print(f"{'':<24} {backend + '/mpl':<11} {seconds / base_seconds:8.2f}x {size / base_size:8.2f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,303 @@
+"""앱 전체 차트 렌더링 벤치마크 (브라우저 없이 AppTest로 실행).
+
+    python benchmarks/bench_charts.py                          # 세 앱, 원본 데이터
+    python benchmarks/bench_charts.py --pages app3.py --scales 1 10 100
+    python benchmarks/bench_charts.py --limit 3 --output before.json
+    python benchmarks/bench_charts.py --output after.json --compare before.json
+
+페이지마다 캐시를 비운 상태로 한 번 실행한 뒤, 위젯(selectbox, toggle)마다 모든 값을
+차례로 선택하며 다시 실행한다. 각 차트는 자신이 의존하는 위젯 값이 바뀔 때만
+새로 그려지므로 (나머지는 캐시 적중) 차트 x 위젯 값 조합이 모두 한 번씩 측정된다.
+
+단계별 시간 (초):
+- load:      CSV/스냅샷 읽기와 정제 (data:<파일>)
+- build:     그림 만들기 (matplotlib/folium build 함수, 분기 지도)
+- serialize: PNG 저장, folium HTML 생성, plotly_chart 직렬화, Altair 차트 (만들기 포함)
+- script:    한 번 실행 전체에서 위 단계를 뺀 나머지 (전처리, 위젯, 레이아웃)
+
+--scales로 폐업률.csv 등을 N배로 늘린 합성 데이터(임시 폴더)에서 같은 측정을 하며,
+배율마다 새 프로세스에서 실행한다. 결과는 JSON으로 저장해 커밋 간 비교할 수 있다.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+
+PAGES = ['app1.py', 'app2.py', 'app3.py']
+SCALED_FILES = ['폐업률.csv']
+
+
+# ---- 합성 데이터 -------------------------------------------------------------
+
+def scale_frame(df, factor, seed=0):
+    """행을 factor배로 늘린다. 복제본은 업종 이름을 바꿔 서로 다른 행이 되도록 하고
+    폐업률에는 작은 잡음을 더해 집계 결과가 그대로 복사되지 않게 한다."""
+    rng = np.random.default_rng(seed)
+    copies = []
+    for i in range(factor):
+        copy = df.copy()
+        if i and '서비스_업종_코드_명' in copy:
+            copy['서비스_업종_코드_명'] = copy['서비스_업종_코드_명'].astype(str) + f'_{i}'
+        if i and '폐업_률' in copy:
+            copy['폐업_률'] = (copy['폐업_률'] + rng.normal(0, 0.1, len(copy))).round(1)
+        copies.append(copy)
+    return pd.concat(copies, ignore_index=True)
+
+
+def make_data_dir(factor, names):
+    """원본 데이터는 링크로, names는 factor배로 늘린 CSV로 채운 임시 폴더."""
+    data_dir = Path(tempfile.mkdtemp(prefix=f'bench_x{factor}_'))
+    for path in ROOT.iterdir():
+        if path.suffix in ('.csv', '.json') and path.name not in names:
+            (data_dir / path.name).symlink_to(path)
+    for name in names:
+        df = pd.read_csv(ROOT / name)
+        scale_frame(df, factor).to_csv(data_dir / name, index=False)
+    return data_dir
+
+
+# ---- 계측 --------------------------------------------------------------------
+
+class Recorder:
+    def __init__(self):
+        self.records = []
+        self.context = {}
+        self._serialize = 0.0
+        self._plotly = 0
+
+    def add(self, chart, stage, seconds):
+        self.records.append({**self.context, 'chart': chart, 'stage': stage, 'seconds': seconds})
+
+    def timed(self, func, chart, stage):
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            # None은 실제 작업 없이 건너뛴 경우 (예: 오래된 스냅샷)
+            if result is not None:
+                self.add(chart(*args, **kwargs), stage, time.perf_counter() - start)
+            return result
+        return wrapper
+
+    def serializer(self, func):
+        # build 안에서 불리는 직렬화 시간은 따로 모아 build 시간에서 뺌
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._serialize += time.perf_counter() - start
+        return wrapper
+
+    def install(self):
+        """앱이 쓰는 모듈 함수를 감싸 단계별 시간을 기록한다 (벤치마크 프로세스에서만)."""
+        import streamlit as st
+
+        import choropleth
+        import figure_cache
+        import point_map
+        import snapshots
+
+        snapshots.read_snapshot = self.timed(snapshots.read_snapshot, lambda path: 'data:' + Path(path).name, 'load')
+        snapshots.read_csv = self.timed(snapshots.read_csv, lambda path: 'data:' + Path(path).name, 'load')
+        figure_cache.render = self.serializer(figure_cache.render)
+        point_map.render = self.serializer(point_map.render)
+        # Altair 차트는 만들기와 전송을 나누지 않고 함께 기록
+        figure_cache.vega_chart = self.timed(figure_cache.vega_chart, lambda chart, *args, **kwargs: chart.chart_id, 'serialize')
+
+        cached = figure_cache.cached
+
+        def timed_cached(chart_id, build, key=(), data=()):
+            def timed_build():
+                self._serialize = 0.0
+                start = time.perf_counter()
+                value = build()
+                total = time.perf_counter() - start
+                self.add(chart_id, 'build', total - self._serialize)
+                self.add(chart_id, 'serialize', self._serialize)
+                return value
+            return cached(chart_id, timed_build, key, data)
+
+        figure_cache.cached = timed_cached
+
+        figures = {
+            '_quarter_figure': lambda map_id, *args: f'choropleth:{map_id}',
+            '_animated_figure': lambda map_id, *args: f'choropleth:{map_id}:animated',
+            '_density_figure': lambda *args: 'choropleth:density',
+        }
+        for name, chart in figures.items():
+            # st.cache_resource 안쪽 함수를 감싸 캐시 미스(실제로 만든 경우)만 기록
+            wrapped = getattr(choropleth, name)
+            inner = self.timed(wrapped.__wrapped__, chart, 'build')
+            setattr(choropleth, name, st.cache_resource(max_entries=choropleth.MAX_FIGURES, show_spinner=False)(inner))
+
+        plotly_chart = st.plotly_chart
+
+        def timed_plotly_chart(*args, **kwargs):
+            self._plotly += 1
+            start = time.perf_counter()
+            try:
+                return plotly_chart(*args, **kwargs)
+            finally:
+                self.add(f'plotly_chart[{self._plotly - 1}]', 'serialize', time.perf_counter() - start)
+
+        st.plotly_chart = timed_plotly_chart
+
+    def run(self, at, **context):
+        self.context = context
+        self._plotly = 0
+        first = len(self.records)
+        start = time.perf_counter()
+        at.run()
+        elapsed = time.perf_counter() - start
+        measured = sum(record['seconds'] for record in self.records[first:])
+        self.add('page', 'script', max(elapsed - measured, 0.0))
+        if at.exception:
+            raise RuntimeError(f'{context}: {at.exception[0].message}')
+
+
+def widgets(at):
+    for kind in ('selectbox', 'toggle'):
+        for index, widget in enumerate(getattr(at, kind)):
+            values = list(widget.options) if kind == 'selectbox' else [True, False]
+            # 같은 이름의 위젯은 key로 구분
+            name = f'{widget.label} ({widget.key})' if widget.key else widget.label
+            yield kind, index, name, values
+
+
+def bench_page(recorder, page, limit=None, timeout=600):
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    st.cache_resource.clear()
+    st.cache_data.clear()
+    at = AppTest.from_file(str(ROOT / page), default_timeout=timeout)
+    recorder.run(at, page=page, widget=None, value=None)
+    for kind, index, label, values in list(widgets(at)):
+        for value in values[:limit]:
+            getattr(at, kind)[index].set_value(value)
+            recorder.run(at, page=page, widget=label, value=str(value))
+
+
+def worker(args):
+    sys.path.insert(0, str(ROOT))
+    os.chdir(ROOT)
+    recorder = Recorder()
+    recorder.install()
+    for page in args.pages:
+        bench_page(recorder, page, args.limit)
+    return recorder.records
+
+
+# ---- 결과 --------------------------------------------------------------------
+
+def summarize(records):
+    groups = defaultdict(list)
+    for record in records:
+        groups[(record['scale'], record['page'], record['chart'], record['stage'])].append(record['seconds'])
+    summary = []
+    for (scale, page, chart, stage), values in sorted(groups.items()):
+        values.sort()
+        summary.append({
+            'scale': scale, 'page': page, 'chart': chart, 'stage': stage, 'n': len(values),
+            'median': statistics.median(values),
+            'p95': values[min(len(values) - 1, int(len(values) * 0.95))],
+            'max': values[-1],
+            'total': sum(values),
+        })
+    return summary
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, cwd=ROOT).stdout.strip()
+    except OSError:
+        return None
+
+
+def print_summary(summary, baseline=None):
+    base = {(row['scale'], row['page'], row['chart'], row['stage']): row for row in baseline or []}
+    header = f"{'scale':>5} {'page':<8} {'chart':<36} {'stage':<9} {'n':>4} {'median':>9} {'p95':>9} {'total':>9}"
+    print(header + ('   vs base' if baseline else ''))
+    for row in summary:
+        line = (f"{row['scale']:>5} {row['page']:<8} {row['chart']:<36} {row['stage']:<9} {row['n']:>4} "
+                f"{row['median']:9.4f} {row['p95']:9.4f} {row['total']:9.3f}")
+        old = base.get((row['scale'], row['page'], row['chart'], row['stage']))
+        if old and old['median'] > 0:
+            line += f"   {row['median'] / old['median']:6.2f}x"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='차트별 렌더링 시간 측정')
+    parser.add_argument('--pages', nargs='*', default=PAGES)
+    parser.add_argument('--scales', nargs='*', type=int, default=[1], help='합성 데이터 배율')
+    parser.add_argument('--scale-files', nargs='*', default=SCALED_FILES, help='배율을 적용할 CSV')
+    parser.add_argument('--limit', type=int, help='위젯마다 측정할 값 개수 (기본: 전부)')
+    parser.add_argument('--output', help='결과 JSON 경로')
+    parser.add_argument('--compare', help='비교할 이전 결과 JSON')
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        # 워커: 결과를 지정된 파일에 기록 (stdout에는 Streamlit 로그가 섞일 수 있음)
+        with open(args.worker, 'w', encoding='utf-8') as f:
+            json.dump(worker(args), f)
+        return 0
+
+    records = []
+    for scale in args.scales:
+        env = dict(os.environ)
+        data_dir = make_data_dir(scale, args.scale_files) if scale != 1 else None
+        if data_dir:
+            env['DASHBOARD_DATA_DIR'] = str(data_dir)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'records.json'
+            command = [sys.executable, __file__, '--worker', str(path), '--pages', *args.pages]
+            if args.limit:
+                command += ['--limit', str(args.limit)]
+            output = subprocess.run(command, env=env, capture_output=True, text=True, cwd=ROOT)
+            if data_dir:
+                shutil.rmtree(data_dir)
+            if output.returncode:
+                sys.stderr.write(output.stderr)
+                return output.returncode
+            records += [{**record, 'scale': scale} for record in json.loads(path.read_text(encoding='utf-8'))]
+
+    result = {
+        'meta': {
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'pages': args.pages,
+            'scales': args.scales,
+            'limit': args.limit,
+        },
+        'summary': summarize(records),
+        'records': records,
+    }
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)['summary']
+    print_summary(result['summary'], baseline)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=1)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,99 @@
+"""전국 규모 합성 폐업률 CSV에서 통째로 읽기 vs chunked 로더의 시간과 최대 RSS.
+
+    python benchmarks/bench_chunked.py                         # 200만 행
+    python benchmarks/bench_chunked.py --rows 20000000 --max-mb 1024
+
+- 시군구 250개 x 업종 100개 x 분기를 채울 만큼 행을 만들어 임시 CSV로 쓴다 (폐업률.csv와 같은 열).
+- whole:   pd.read_csv + cleaning.clean + ClosureCube (지금 app3 방식)
+- chunked: chunked.load (좁은 형식, 청크별 집계, --max-mb 상한)
+- 방식마다 새 프로세스에서 실행해 최대 RSS(ru_maxrss)를 따로 잰다.
+"""
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+DISTRICTS = 250
+INDUSTRIES = 100
+
+RUN = {
+    'whole': (
+        "import pandas as pd, cleaning, rollup\n"
+        "df = cleaning.clean(pd.read_csv(PATH, **cleaning.READ_OPTIONS))\n"
+        "cube = rollup.ClosureCube(df)\n"
+        "print(len(df), len(cube.rollup('년_분기')))\n"
+    ),
+    'chunked': (
+        "import chunked\n"
+        "result = chunked.load(PATH, max_mb=MAX_MB)\n"
+        "print(result.rows, len(result.cube.rollup('년_분기')))\n"
+    ),
+}
+PEAK = "import instrument; print(f'{instrument.peak_rss_mb():.0f}')\n"
+
+
+def write_csv(path, rows, seed=0):
+    rng = np.random.default_rng(seed)
+    cells = DISTRICTS * INDUSTRIES
+    quarters = -(-rows // cells)
+    labels = [f'{2010 + q // 4}-0{q % 4 + 1}' for q in range(quarters)]
+    step = 1_000_000
+    for start in range(0, rows, step):
+        index = np.arange(start, min(start + step, rows))
+        quarter = index // cells
+        stores = rng.integers(10, 5000, len(index))
+        frame = pd.DataFrame({
+            '자치구_코드_명': pd.Categorical.from_codes(index % DISTRICTS, [f'시군구{i:03d}' for i in range(DISTRICTS)]),
+            '서비스_업종_코드_명': pd.Categorical.from_codes(index // DISTRICTS % INDUSTRIES,
+                                                        [f'업종{i:03d}' for i in range(INDUSTRIES)]),
+            '점포_수': stores,
+            '폐업_률': np.round(rng.uniform(0, 10, len(index)), 1),
+            '폐업_점포_수': stores // 30,
+            '프랜차이즈_점포_수': stores // 10,
+            '년': 2010 + quarter // 4,
+            '분기': quarter % 4 + 1,
+            '년_분기': np.array(labels, dtype=object)[quarter],
+        })
+        frame.to_csv(path, mode='a', header=start == 0, index=False)
+
+
+def run(mode, path, max_mb):
+    code = f'import sys; sys.path.insert(0, {str(ROOT)!r})\nPATH = {str(path)!r}\nMAX_MB = {max_mb}\n' + RUN[mode] + PEAK
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True)
+    seconds = time.perf_counter() - start
+    if result.returncode:
+        return seconds, None, result.stderr.strip().splitlines()[-1]
+    *_, peak = result.stdout.split()
+    return seconds, float(peak), ''
+
+
+def main():
+    parser = argparse.ArgumentParser(description='통째로 읽기 vs chunked 로더 시간과 최대 RSS')
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    parser.add_argument('--max-mb', type=float, default=512, help='chunked 로더 메모리 상한')
+    parser.add_argument('--modes', nargs='*', default=list(RUN))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / '폐업률_전국.csv'
+        write_csv(path, args.rows)
+        print(f'{args.rows:,}행, {path.stat().st_size / 1024 / 1024:.0f}MB CSV')
+        print(f"{'mode':<8} {'seconds':>8} {'peak MB':>8}")
+        for mode in args.modes:
+            seconds, peak, error = run(mode, path, args.max_mb)
+            peak = f'{peak:8.0f}' if peak is not None else f"{'-':>8}  {error}"
+            print(f'{mode:<8} {seconds:8.1f} {peak}')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,74 @@
+"""연도 열 숫자 변환: 기존 값별 변환 vs cleaning 단계 비교.
+
+    python benchmarks/bench_cleaning.py
+    python benchmarks/bench_cleaning.py --rows 25 2500 25000 --repeat 5
+
+- per-row:    기존 app2 방식 (열마다 값마다 람다로 콤마 제거)
+- to_float64: 이미 읽은 문자열 프레임을 한 번에 변환
+- read+clean: READ_OPTIONS로 파싱 단계에서 처리 (CSV 읽기 포함, 기존 방식도 읽기 포함해 비교)
+"""
+import argparse
+import io
+import sys
+import timeit
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cleaning import READ_OPTIONS, clean, to_float64  # noqa: E402
+
+YEARS = ['2019', '2020', '2021', '2022']
+
+
+def make_frame(rows, seed=0):
+    # 사업체종사자수_pre.csv와 같은 형태: "39,679" 같은 천 단위 구분 문자열
+    rng = np.random.default_rng(seed)
+    data = {'지역': [f'지역{i}' for i in range(rows)]}
+    for year in YEARS:
+        for kind in ('사업체수', '종사자수'):
+            data[f'{year} {kind}'] = [f'{value:,}' for value in rng.integers(1_000, 500_000, rows)]
+    return pd.DataFrame(data)
+
+
+def per_row(df):
+    # 기존 app2 방식: 열마다 값마다 파이썬 람다로 변환
+    df = df.copy()
+    for column in df.columns[1:]:
+        df[column] = df[column].apply(lambda x: float(x.replace(',', '')))
+    return df
+
+
+def best(func, repeat):
+    return min(timeit.repeat(func, number=1, repeat=repeat)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, nargs='+', default=[25, 250, 2_500, 25_000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'per-row':>10} {'to_float64':>11} {'speedup':>8}"
+          f" {'read+per-row':>13} {'read+clean':>11} {'speedup':>8}  (ms)")
+    for rows in args.rows:
+        df = make_frame(rows)
+        text = df.to_csv(index=False)
+        expected = per_row(df)
+        pd.testing.assert_frame_equal(to_float64(df), expected)
+        pd.testing.assert_frame_equal(
+            clean(pd.read_csv(io.StringIO(text), **READ_OPTIONS)).drop(columns='지역'),
+            expected.drop(columns='지역'))
+
+        slow = best(lambda: per_row(df), args.repeat)
+        fast = best(lambda: to_float64(df), args.repeat)
+        slow_read = best(lambda: per_row(pd.read_csv(io.StringIO(text))), args.repeat)
+        fast_read = best(lambda: clean(pd.read_csv(io.StringIO(text), **READ_OPTIONS)), args.repeat)
+        print(f'{rows:>8} {slow:>10.2f} {fast:>11.2f} {slow / fast:>7.1f}x'
+              f' {slow_read:>13.2f} {fast_read:>11.2f} {slow_read / fast_read:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""지도 경계 단계별 크기와 인코딩 시간 (원본 GeoJSON vs geometry 단계).
+
+    python benchmarks/bench_geometry.py
+    python benchmarks/bench_geometry.py --scale 4 --densify 8   # 행정동 규모 합성 경계로 단순화 시간 측정
+
+- geometry: 점 수, GeoJSON JSON 크기, gzip 크기, json.dumps 시간
+- figure:   app3 분기 지도 하나(choropleth_mapbox)를 fig.to_json()으로 직렬화한 크기와 시간
+            (정적 파일 제공이 꺼져 있으면 지도마다 경계가 통째로 들어감, app3 한 화면에 지도 4개)
+- scale:    원본 경계를 잘게 나누고(--densify) 격자로 복제한(--scale^2) 합성 경계에서 단계 생성 시간
+"""
+import argparse
+import gzip
+import json
+import math
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import choropleth  # noqa: E402
+import geometry  # noqa: E402
+
+GEOJSON = ROOT / choropleth.GEOJSON_NAME
+
+
+def best_ms(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def points(geojson):
+    return sum(len(ring) for feature in geojson['features']
+               for polygon in geometry._polygons(feature['geometry']) for ring in polygon)
+
+
+def figure_json(geojson):
+    import plotly.express as px
+    from data_loader import load_table
+
+    config = choropleth.MAPS['franchise']
+    df = load_table(config['data'])
+    frame = df[df['년_분기'] == df['년_분기'].min()]
+    fig = px.choropleth_mapbox(frame, geojson=geojson, locations='자치구_코드_명', color=config['color'],
+                               color_continuous_scale=config['scale'], **choropleth.MAP_STYLE)
+    return fig
+
+
+def synthetic(geojson, densify, scale):
+    """경계마다 점을 densify배로 늘리고(이웃 구역과 같은 점) scale x scale 격자로 복제한 GeoJSON."""
+    def wiggle(a, b):
+        # 같은 변은 어느 구역에서 보든 같은 점이 생기도록 정렬된 끝점으로 계산
+        (x0, y0), (x1, y1) = sorted([tuple(a), tuple(b)])
+        extra = []
+        for k in range(1, densify):
+            t = k / densify
+            offset = 1e-4 * math.sin(x0 * 1e4 + y1 * 1e4 + k)
+            extra.append([x0 + (x1 - x0) * t - (y1 - y0) * offset, y0 + (y1 - y0) * t + (x1 - x0) * offset])
+        return extra if [x0, y0] == list(a) else extra[::-1]
+
+    features = []
+    width, height = 0.45, 0.3
+    for row in range(scale):
+        for column in range(scale):
+            for feature in geojson['features']:
+                ring = feature['geometry']['coordinates'][0]
+                dense = []
+                for a, b in zip(ring, ring[1:]):
+                    dense.append(a)
+                    dense.extend(wiggle(a, b))
+                dense.append(ring[-1])
+                moved = [[x + column * width, y + row * height] for x, y in dense]
+                features.append({'type': 'Feature', 'properties': {**feature['properties'], 'copy': (row, column)},
+                                 'geometry': {'type': 'Polygon', 'coordinates': [moved]}})
+    return {'type': 'FeatureCollection', 'features': features}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='지도 경계 단계별 크기와 인코딩 시간')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--densify', type=int, default=8, help='합성 경계: 변마다 점 배수')
+    parser.add_argument('--scale', type=int, default=4, help='합성 경계: 격자 복제 (scale^2배 구역)')
+    args = parser.parse_args()
+
+    with open(GEOJSON, encoding='utf-8') as f:
+        raw = json.load(f)
+    arrays = geometry.build_tiers(raw)
+    variants = {'raw': raw, **{tier: geometry.to_geojson(arrays, tier) for tier in geometry.TIERS}}
+
+    print(f"{'geometry':<8} {'points':>7} {'json B':>8} {'gzip B':>8} {'dumps ms':>9} {'fig B':>8} {'to_json ms':>11}")
+    for name, geojson in variants.items():
+        text = json.dumps(geojson, ensure_ascii=False, separators=(',', ':'))
+        dumps = best_ms(lambda: json.dumps(geojson, ensure_ascii=False, separators=(',', ':')), args.repeat)
+        fig = figure_json(geojson)
+        fig_text = fig.to_json()
+        to_json = best_ms(fig.to_json, args.repeat)
+        print(f'{name:<8} {points(geojson):>7} {len(text.encode()):>8} {len(gzip.compress(text.encode())):>8} '
+              f'{dumps:9.2f} {len(fig_text.encode()):>8} {to_json:11.2f}')
+    tier = geometry.tier_for_zoom(choropleth.MAP_STYLE['zoom'])
+    print(f"지도 zoom {choropleth.MAP_STYLE['zoom']} -> {tier} 단계")
+
+    dense = synthetic(raw, args.densify, args.scale)
+    start = time.perf_counter()
+    dense_arrays = geometry.build_tiers(dense)
+    build = time.perf_counter() - start
+    counts = ', '.join(f"{tier} {len(dense_arrays[f'{tier}_coords'])}" for tier in geometry.TIERS)
+    print(f"scale: {len(dense['features'])} 구역, {points(dense)} 점 -> {counts}; 단계 생성 {build:.2f}초")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,87 @@
+"""페이지 하나의 이미지/HTML 차트를 한 번에 그리는 시간: 순서대로 vs 렌더 풀.
+
+    python benchmarks/bench_render_pool.py
+    python benchmarks/bench_render_pool.py --workers 2 4 --repeat 5
+
+페이지가 처음 열릴 때 그리는 차트 묶음(기본 위젯 값)을 FigureCache 없이 매번 새로 그린다.
+- serial: 이 프로세스에서 하나씩 (풀을 끈 상태와 같음)
+- pool N: 워커 N개에 한꺼번에 넘기고 모두 끝날 때까지 (render_pool.flush와 같음)
+워커 기동과 데이터 읽기는 미리 한 번 돌려 둔 뒤 측정한다. 코어 수보다 워커가 많으면 이득이 없다.
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from multiprocessing import get_context
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import render_pool  # noqa: E402
+
+
+def page_charts():
+    """페이지별 첫 화면의 (chart_id, 인자) 목록."""
+    from charts import data
+
+    region = data.rents()['지역'].iloc[0]
+    quarter = data.rent_locations().columns[1]
+    district = data.load_table(data.CLOSURE)['자치구_코드_명'].iloc[0]
+    return {
+        'app1.py': [('rent_line', (region,)), ('rent_map', (quarter,)), ('rent_minmax', ()), ('cpi_vs_loan', ())],
+        'app2.py': [('gdp_bars', ('2019',)), ('gdp_pie', ('2019',)), ('employment_map', ('2019',)), ('gni_line', ())],
+        'app3.py': [('yearly_closure', ()), ('quarterly_closure', ()),
+                    ('district_closure', (district,)), ('district_closed_stores', (district,))],
+    }
+
+
+def serial(cases):
+    start = time.perf_counter()
+    for chart_id, args in cases:
+        render_pool.render_chart(chart_id, args)
+    return time.perf_counter() - start
+
+
+def pooled(executor, cases):
+    start = time.perf_counter()
+    wait([executor.submit(render_pool.render_chart, chart_id, args) for chart_id, args in cases])
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='렌더 풀 사용 전후 페이지 차트 시간 비교')
+    parser.add_argument('--workers', type=int, nargs='*', default=[2, 4])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    render_pool._init_worker(str(ROOT))
+    pages = page_charts()
+    print(f'cpu: {os.cpu_count()}')
+
+    results = {}
+    for page, cases in pages.items():
+        serial(cases)  # 데이터 읽기, import 미리
+        results[(page, 'serial')] = min(serial(cases) for _ in range(args.repeat))
+
+    for workers in args.workers:
+        executor = ProcessPoolExecutor(workers, mp_context=get_context('spawn'),
+                                       initializer=render_pool._init_worker, initargs=(str(ROOT),))
+        with executor:
+            for page, cases in pages.items():
+                # 모든 워커가 데이터를 읽어 두도록 워커 수만큼 돌림
+                for _ in range(workers):
+                    pooled(executor, cases)
+                results[(page, f'pool {workers}')] = min(pooled(executor, cases) for _ in range(args.repeat))
+
+    modes = ['serial'] + [f'pool {workers}' for workers in args.workers]
+    print(f"{'page':<8} {'charts':>6} " + ' '.join(f'{mode:>9}' for mode in modes) + '  (s, 최소값)')
+    for page, cases in pages.items():
+        print(f'{page:<8} {len(cases):>6} ' + ' '.join(f'{results[(page, mode)]:9.3f}' for mode in modes))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,101 @@
+"""대시보드 시작 시 import 비용 측정과 예산 검사.
+
+    python benchmarks/import_profile.py             # 라이브러리별 추가 import 시간
+    python benchmarks/import_profile.py --budget    # 시작 경로 import 시간이 예산을 넘으면 실패(종료 코드 1)
+
+각 측정은 새 파이썬 프로세스에서 streamlit과 pandas를 먼저 불러온 뒤
+(모든 페이지가 어차피 쓰는 비용) 해당 모듈을 추가로 불러오는 데 걸린 시간이다.
+시작 경로는 페이지 파일(PAGES)의 최상위 import 중 이 저장소 모듈로 정한다 (tests/test_import_budget.py).
+"""
+import argparse
+import ast
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+BASELINE = ['streamlit', 'pandas']
+LIBRARIES = [
+    'pyarrow', 'matplotlib', 'matplotlib.pyplot', 'seaborn',
+    'plotly.express', 'plotly.graph_objects', 'folium',
+]
+# 시작 경로 import를 읽을 페이지 파일
+PAGES = ['streamlit_app.py', 'app1.py', 'app2.py', 'app3.py']
+# 이 모듈들이 시작 경로에 끌려 들어오면 안 됨 (차트를 실제로 그릴 때만 필요)
+# (plotly 패키지 자체는 streamlit이 먼저 불러오므로 plotly.express만 봄)
+LAZY_MODULES = ['altair', 'matplotlib', 'seaborn', 'folium', 'plotly.express']
+
+STARTUP_BUDGET_MS = 200
+
+_MEASURE = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+for name in {baseline!r}:
+    __import__(name)
+before = set(sys.modules)
+start = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+elapsed = time.perf_counter() - start
+print(json.dumps({{'ms': elapsed * 1000, 'loaded': sorted(set(sys.modules) - before)}}))
+"""
+
+
+def page_modules(pages=PAGES):
+    """페이지 파일의 최상위 import 중 이 저장소의 모듈 (페이지가 처음 열릴 때 불러오는 모듈)."""
+    modules = []
+    for page in pages:
+        tree = ast.parse((ROOT / page).read_text(encoding='utf-8'))
+        for node in tree.body:
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.level == 0:
+                names = [node.module]
+            else:
+                continue
+            for name in names:
+                top = name.split('.')[0]
+                local = (ROOT / f'{top}.py').exists() or (ROOT / top / '__init__.py').exists()
+                if local and name not in modules:
+                    modules.append(name)
+    return modules
+
+
+STARTUP_MODULES = page_modules()
+
+
+def measure(modules, repeat=3):
+    results = []
+    for _ in range(repeat):
+        code = _MEASURE.format(root=str(ROOT), baseline=BASELINE, modules=list(modules))
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True, cwd=ROOT)
+        results.append(json.loads(output.stdout.strip().splitlines()[-1]))
+    best = min(results, key=lambda result: result['ms'])
+    return best['ms'], best['loaded']
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--budget', action='store_true', help='시작 경로 import 예산 검사')
+    parser.add_argument('--budget-ms', type=float, default=STARTUP_BUDGET_MS)
+    args = parser.parse_args()
+
+    if not args.budget:
+        for name in LIBRARIES:
+            ms, _ = measure([name])
+            print(f'{name:<24} {ms:8.1f} ms')
+
+    ms, loaded = measure(STARTUP_MODULES)
+    eager = [name for name in LAZY_MODULES if name in loaded]
+    print(f"{'startup modules':<24} {ms:8.1f} ms (budget {args.budget_ms:.0f} ms)")
+    if eager:
+        print('eagerly imported: ' + ', '.join(eager))
+    if args.budget and (ms > args.budget_ms or eager):
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,87 @@
+"""matplotlib 차트를 반복해서 그리며 메모리(RSS)가 늘지 않는지 확인하는 장시간 테스트.
+
+    python benchmarks/soak_figures.py                      # 10,000회
+    python benchmarks/soak_figures.py --iterations 500 --sample 50
+
+한 번이 캐시에 없는 재실행 하나에 해당한다: 이미지 차트의 (차트, 위젯 값) 조합을 차례로 돌며
+빌더로 Figure를 만들고 figure_cache.render로 PNG를 저장한다 (FigureCache는 거치지 않음).
+sample회마다 현재 RSS, pyplot에 남은 Figure 수, 살아 있는 Figure 객체 수를 출력하고,
+워밍업 뒤 앞쪽 1/3 대비 마지막 1/3 구간의 RSS 중앙값 증가가 --tolerance를 넘으면 종료 코드 1
+(할당자가 메모리를 돌려주는 시점에 따라 표본 하나하나는 수십 MB씩 오르내림).
+"""
+import argparse
+import gc
+import itertools
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import matplotlib  # noqa: E402
+
+matplotlib.use('Agg')
+
+import charts  # noqa: E402
+import figure_cache  # noqa: E402
+import fonts  # noqa: E402
+import instrument  # noqa: E402
+
+
+def live_figures():
+    from matplotlib.figure import Figure
+    return sum(isinstance(obj, Figure) for obj in gc.get_objects())
+
+
+def pyplot_figures():
+    # pyplot을 아무도 불러오지 않았으면 레지스트리도 없음
+    pyplot = sys.modules.get('matplotlib.pyplot')
+    return len(pyplot.get_fignums()) if pyplot else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='차트 반복 렌더링 메모리 누수 검사')
+    parser.add_argument('--iterations', type=int, default=10_000)
+    parser.add_argument('--sample', type=int, default=500, help='몇 회마다 기록할지')
+    parser.add_argument('--warmup', type=int, help='기준 RSS를 잡기 전 횟수 (기본: 조합 수 x 2)')
+    parser.add_argument('--tolerance', type=float, default=0.05, help='허용 RSS 증가 비율')
+    args = parser.parse_args()
+
+    if instrument.rss_mb() is None:
+        print('현재 RSS를 잴 수 없는 환경 (/proc 없음)')
+        return 1
+    fonts.setup()
+    # 등록된 기본 빌더가 matplotlib 버전 (다른 백엔드가 선택된 차트도 포함)
+    jobs = [(build, chart_args)
+            for build in charts.CHARTS.values() if build.output == 'image'
+            for chart_args in charts.states(build)]
+    warmup = args.warmup if args.warmup is not None else len(jobs) * 2
+    print(f'{len(jobs)} chart states, {args.iterations} iterations')
+    print(f"{'iter':>7} {'rss MB':>8} {'pyplot':>7} {'figures':>8} {'s/iter':>7}")
+
+    samples = []
+    start = time.perf_counter()
+    for i, (build, chart_args) in enumerate(itertools.islice(itertools.cycle(jobs), args.iterations), 1):
+        figure_cache.render(build(*chart_args))
+        if i % args.sample and i != args.iterations:
+            continue
+        rss = instrument.rss_mb()
+        if i >= warmup:
+            samples.append(rss)
+        elapsed = (time.perf_counter() - start) / i
+        print(f'{i:>7} {rss:8.1f} {pyplot_figures():>7} {live_figures():>8} {elapsed:7.3f}', flush=True)
+
+    if len(samples) < 3:
+        print('워밍업 뒤 표본이 3개보다 적어 증가량을 판단하지 않음')
+        return 0
+    third = len(samples) // 3
+    before = statistics.median(samples[:third])
+    after = statistics.median(samples[-third:])
+    growth = after / before - 1
+    print(f'RSS 중앙값 {before:.1f}MB -> {after:.1f}MB ({growth:+.1%}), 허용 {args.tolerance:.0%}')
+    return 1 if growth > args.tolerance else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,24 @@
+"""차트 빌더 모음. 차트마다 위젯 값만 인자로 받는 함수 하나이며 그림 객체를 반환한다.
+
+    fig = charts.rent_line('서울')              # matplotlib Figure
+    figure_cache.show(charts.rent_line, '서울')  # (차트, 인자, 데이터 버전)으로 캐시해 표시
+
+빌더는 `charts.data`의 전처리된 공유 데이터만 읽고 Streamlit 요소를 만들지 않으므로
+페이지 밖(미리 그리기, 벤치마크)에서도 그대로 호출할 수 있다.
+"""
+from charts.base import CHARTS, chart, load_backend, states
+from charts.closure import (
+    closed_stores_choropleth,
+    closure_rate_choropleth,
+    density_choropleth,
+    district_closed_stores,
+    district_closure,
+    dong_density,
+    franchise_choropleth,
+    quarterly_closure,
+    yearly_closure,
+)
+from charts.economy import employment_map, gdp_bars, gdp_pie, gni_line
+from charts.rent import cpi_vs_loan, rent_line, rent_map, rent_minmax
+
+# 다른 백엔드 버전(charts.vega 등)은 DASHBOARD_CHART_BACKENDS로 처음 선택될 때 등록된다 (charts.base.select)
@@ -0,0 +1,101 @@
+import importlib
+import os
+
+# chart_id -> 빌더 함수 (미리 그리기, 벤치마크 등에서 전체 차트를 순회할 때 사용)
+CHARTS = {}
+
+# 빌더가 반환하는 것
+#   image:  matplotlib Figure (PNG로 렌더링해 figure_cache에 저장)
+#   html:   HTML 문자열 (folium 지도, figure_cache에 저장)
+#   plotly: plotly Figure (choropleth 모듈이 인자와 데이터 버전으로 캐시)
+#   vega:   Altair 차트 (Vega-Lite 명세와 데이터만 보내고 브라우저가 그림)
+OUTPUTS = ('image', 'html', 'plotly', 'vega')
+
+# @chart로 등록한 기본 빌더의 백엔드 이름
+DEFAULT_BACKEND = 'matplotlib'
+
+# 백엔드 -> 그 백엔드 버전을 등록하는 모듈 (처음 선택될 때 불러와 페이지 import에 Altair 등이 끌려오지 않음)
+BACKEND_MODULES = {'vega': 'charts.vega'}
+
+
+def parse_backends(text):
+    """'vega' 또는 'vega,rent_line=matplotlib' -> (기본 백엔드, {chart_id: 백엔드})."""
+    default, per_chart = DEFAULT_BACKEND, {}
+    for item in filter(None, (part.strip() for part in text.split(','))):
+        name, _, backend = item.rpartition('=')
+        if name:
+            per_chart[name] = backend
+        else:
+            default = backend
+    return default, per_chart
+
+
+# 차트별로 쓸 백엔드. 해당 백엔드로 만든 빌더가 없는 차트는 기본 빌더를 쓴다.
+#   DASHBOARD_CHART_BACKENDS=matplotlib                 # 모두 서버에서 PNG로
+#   DASHBOARD_CHART_BACKENDS=vega,cpi_vs_loan=matplotlib
+BACKEND, BACKENDS = parse_backends(os.environ.get('DASHBOARD_CHART_BACKENDS', 'vega'))
+
+
+def chart(*data, output='image', options=None):
+    """차트 빌더 등록. 함수 이름을 chart_id로, 사용하는 데이터 파일과 출력 종류를 함수에 붙인다.
+
+    빌더는 위젯 값만 인자로 받고, 같은 인자와 같은 데이터 버전이면 같은 결과를 돌려줘야 한다
+    (캐시 키가 (chart_id, 인자, data 파일 버전)이므로).
+    인자를 받는 빌더는 options에 위젯 선택지 목록을 돌려주는 함수를 넘긴다 (미리 그리기에서 순회).
+    """
+    if output not in OUTPUTS:
+        raise ValueError(f'알 수 없는 출력 종류: {output}')
+
+    def decorate(build):
+        build.chart_id = build.__name__
+        build.data = data
+        build.output = output
+        build.options = options
+        build.variants = {DEFAULT_BACKEND: build}
+        build.variant = lambda backend, output=None: _variant(build, backend, output or backend)
+        build.select = lambda: select(build)
+        CHARTS[build.chart_id] = build
+        return build
+    return decorate
+
+
+def _variant(base, backend, output):
+    """같은 차트를 다른 백엔드로 그리는 빌더 등록 (`@charts.rent_line.variant('vega')`).
+
+    chart_id, 데이터 파일, 위젯 선택지는 기본 빌더와 같고 출력 종류만 다르다.
+    """
+    if output not in OUTPUTS:
+        raise ValueError(f'알 수 없는 출력 종류: {output}')
+
+    def decorate(build):
+        build.chart_id = base.chart_id
+        build.data = base.data
+        build.output = output
+        build.options = base.options
+        build.select = lambda: build
+        base.variants[backend] = build
+        return build
+    return decorate
+
+
+def load_backend(backend):
+    """backend 버전 빌더들을 등록한다 (이미 불러왔으면 아무것도 안 함)."""
+    if backend in BACKEND_MODULES:
+        importlib.import_module(BACKEND_MODULES[backend])
+
+
+def select(build):
+    """설정(DASHBOARD_CHART_BACKENDS)에 따라 이 차트를 그릴 빌더."""
+    backend = BACKENDS.get(build.chart_id, BACKEND)
+    load_backend(backend)
+    return build.variants.get(backend, build)
+
+
+def states(build):
+    """빌더가 받을 수 있는 모든 인자 조합 (위젯 선택지 순서대로).
+
+    인자가 여럿인 빌더의 options는 인자 튜플 목록을 돌려준다.
+    """
+    if build.options is None:
+        return [()]
+    return [value if isinstance(value, tuple) else (value,) for value in build.options()]
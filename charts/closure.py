@@ -0,0 +1,121 @@
+"""app3: 폐업률, 폐업 점포 수, 프랜차이즈, 인구밀도 차트."""
+import choropleth
+import density
+import figure_cache
+import query
+import rollup
+from charts import data
+from charts.base import chart
+
+
+@chart(data.CLOSURE)
+def yearly_closure():
+    """년도별 평균 폐업률과 95% 신뢰구간."""
+    # 서브플롯 생성
+    fig, ax = figure_cache.figure((10, 6))
+
+    # 년도별 폐업률 그래프 (미리 집계된 평균과 95% 신뢰구간)
+    rollup.plot_mean(ax, query.fetch('closure_mean', by='년'))
+    ax.set_title("년도별 폐업률")
+
+    # 그래프 레이아웃 조정
+    fig.tight_layout()
+    return fig
+
+
+@chart(data.CLOSURE)
+def quarterly_closure():
+    """분기별 평균 폐업률과 95% 신뢰구간."""
+    # 서브플롯 생성
+    fig, ax = figure_cache.figure((10, 6))
+
+    # 분기별 폐업률 그래프
+    rollup.plot_mean(ax, query.fetch('closure_mean', by='분기'))
+    ax.set_title("분기별 폐업률")
+
+    # 그래프 레이아웃 조정
+    fig.tight_layout()
+    return fig
+
+
+def _districts():
+    return query.values('districts', '자치구_코드_명')
+
+
+@chart(data.CLOSURE, options=_districts)
+def district_closure(district):
+    """자치구의 년/분기별 평균 폐업률."""
+    fig, ax = figure_cache.figure((20, 8))
+    # 자치구별 분기 평균은 로드 시 미리 계산된 인덱스에서 꺼냄
+    ax.plot(query.fetch('closure_rate_by_quarter', district=district)['폐업_률'])
+    ax.set_title(f"{district} 폐업률")
+    ax.set_xlabel('년/분기')
+    ax.set_ylabel('폐업률')
+    ax.tick_params(axis='x', labelrotation=45)
+    return fig
+
+
+@chart(data.CLOSED_STORES, options=_districts)
+def district_closed_stores(district):
+    """자치구의 년/분기별 폐업 점포 수."""
+    fig, ax = figure_cache.figure((20, 8))
+    ax.plot(query.fetch('closed_stores_by_quarter', district=district)['폐업_점포_수'])
+    ax.set_title(f"{district} 폐업점포수")
+    ax.set_xlabel('년/분기')
+    ax.set_ylabel('폐업점포수')
+    ax.tick_params(axis='x', labelrotation=45)
+    return fig
+
+
+def _choropleth(map_id, quarter):
+    # quarter가 None이면 모든 분기를 슬라이더 애니메이션으로 담은 지도
+    if quarter is None:
+        return choropleth.animated_figure(map_id)
+    return choropleth.quarter_figure(map_id, quarter)
+
+
+def _map_options(map_id):
+    # 분기 선택지와 슬라이더 애니메이션(None)
+    return lambda: [*choropleth.quarters(map_id), None]
+
+
+@chart(choropleth.MAPS['franchise']['data'], output='plotly', options=_map_options('franchise'))
+def franchise_choropleth(quarter=None):
+    """구별 프랜차이즈 점포 수 지도."""
+    return _choropleth('franchise', quarter)
+
+
+@chart(choropleth.MAPS['closure_rate']['data'], output='plotly', options=_map_options('closure_rate'))
+def closure_rate_choropleth(quarter=None):
+    """구별 폐업률 지도."""
+    return _choropleth('closure_rate', quarter)
+
+
+@chart(choropleth.MAPS['closed_stores']['data'], output='plotly', options=_map_options('closed_stores'))
+def closed_stores_choropleth(quarter=None):
+    """구별 폐업 점포 수 지도."""
+    return _choropleth('closed_stores', quarter)
+
+
+@chart(choropleth.DENSITY, output='plotly', options=lambda: query.values('density_years', '연도'))
+def density_choropleth(year):
+    """구별 인구밀도 지도."""
+    return choropleth.density_figure(year)
+
+
+def _dong_options():
+    # (자치구, 연도) 조합
+    return [(district, year) for year in query.values('density_years', '연도') for district in _districts()]
+
+
+@chart(density.DENSITY, options=_dong_options)
+def dong_density(district, year):
+    """자치구 안 행정동별 인구밀도 (높은 순 가로 막대)."""
+    df = query.fetch('dong_density', district=district, year=year)
+    fig, ax = figure_cache.figure((8, 8))
+    ax.barh(df['행정동'], df['인구밀도'], color='#f03b20')  # 인구밀도 지도 색상 스케일의 주황
+    ax.invert_yaxis()  # 높은 값이 위로
+    ax.set_title(f"{district} {year} 행정동 인구밀도")
+    ax.set_xlabel('인구밀도 (명/km²)')
+    fig.tight_layout()
+    return fig
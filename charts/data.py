@@ -0,0 +1,129 @@
+"""차트 빌더가 쓰는 전처리된 데이터. 데이터 파일 버전마다 한 번만 만들어 모든 세션이 공유한다 (읽기 전용)."""
+import pandas as pd
+import streamlit as st
+
+import instrument
+import registry
+import rollup
+from data_loader import freeze, load_table, table_version
+
+RENT = '지역별_소규모_임대료.csv'
+CPI = '소비자물가지수.csv'
+LOAN = '대출금리.csv'
+GDP = '지역내총생산_pre.csv'
+EMPLOYMENT = '사업체종사자수_pre.csv'
+CLOSURE = '폐업률.csv'
+CLOSED_STORES = '폐업_점포_수.csv'
+DENSITY = '서울시 동별 인구밀도.csv'
+
+# 페이지의 연도 선택지
+GDP_YEARS = ['2019', '2020', '2021']
+EMPLOYMENT_YEARS = ['2019', '2020', '2021', '2022']
+
+# 지역 한글을 영어로 매핑하는 딕셔너리 (막대그래프 X축 레이블)
+REGION_NAMES = {
+    '강원': 'Gangwon',
+    '경기': 'Gyeonggi',
+    '경남': 'Gyeongnam',
+    '경북': 'Gyeongbuk',
+    '광주': 'Gwangju',
+    '대구': 'Daegu',
+    '대전': 'Daejeon',
+    '부산': 'Busan',
+    '서울': 'Seoul',
+    '세종': 'Sejong',
+    '울산': 'Ulsan',
+    '인천': 'Incheon',
+    '전남': 'Jeonnam',
+    '전북': 'Jeonbuk',
+    '제주': 'Jeju',
+    '충남': 'Chungnam',
+    '충북': 'Chungbuk'
+}
+
+
+def rents():
+    return load_table(RENT)
+
+
+def rent_locations():
+    # 위도와 경도 데이터를 원본 데이터와 병합
+    return registry.located(RENT, 'provinces')
+
+
+def employment_locations():
+    return registry.located(EMPLOYMENT, 'districts')
+
+
+def regions():
+    return rents()['지역'].unique().tolist()
+
+
+def rent_quarters():
+    # 분기 열 (22_1, 22_2, 22_3, ...)
+    return rent_locations().columns[1:10].tolist()
+
+
+def districts():
+    # 큐브의 자치구/분기 집계에서 꺼냄 (큰 폐업률 CSV를 통째로 읽지 않도록)
+    return rollup.closure_cube().rollup('자치구_코드_명', '년_분기').index.unique(level=0).tolist()
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _prices(version):
+    with instrument.span('물가 날짜 변환', 'transform'):
+        물가 = load_table(CPI).rename(columns={'Unnamed: 0': '날짜'})
+        물가['날짜'] = 물가['날짜'].astype(str).str[:4] + '-' + 물가['날짜'].astype(str).str[4:6]
+    return freeze(물가)
+
+
+def prices():
+    """소비자물가지수 (날짜를 'YYYY-MM' 형식으로 변환)."""
+    return _prices(table_version(CPI))
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _loan_rates(version):
+    with instrument.span('대출금리 보간', 'transform'):
+        대출금리 = load_table(LOAN).copy()  # 공유 데이터이므로 복사 후 수정
+        대출금리['대출금리'] = 대출금리['대출금리'].replace(0, None)  # 0을 NaN으로 바꿔줌
+        대출금리['대출금리'] = 대출금리['대출금리'].interpolate(method='linear')  # 보간법으로 NaN 값 채우기
+        대출금리 = 대출금리[대출금리['날짜'] <= '2024-09']
+    return freeze(대출금리)
+
+
+def loan_rates():
+    """대출금리 (0은 결측으로 보고 선형 보간, 2024-09까지)."""
+    return _loan_rates(table_version(LOAN))
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _rent_extremes(version):
+    df = load_table(RENT).set_index("지역")
+    # 각 지역별 최고값/최소값과 그 차이
+    extremes = pd.DataFrame({"최고값": df.max(axis=1), "최소값": df.min(axis=1)}).reset_index()
+    extremes["지역"] = extremes["지역"].astype(str)
+    extremes["영어지역"] = extremes["지역"].map(REGION_NAMES)
+    extremes["최대-최소 차이"] = extremes["최고값"] - extremes["최소값"]
+    return freeze(extremes)
+
+
+def rent_extremes():
+    """지역별 임대료 최고값, 최소값, 최대-최소 차이."""
+    return _rent_extremes(table_version(RENT))
+
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _gdp(year, version):
+    data = load_table(GDP)
+    # 천 단위 콤마는 로드 시 제거되어 숫자형으로 들어옴
+    return freeze(pd.DataFrame({
+        '지역': data['Unnamed: 0'].astype(str),  # 'Unnamed: 0' 열의 지역명
+        'gdp': data[f"{year} 지역내총생산(백만원)"] / 1_000_000,  # 100만으로 나누기
+        'gdp_per_capita': data[f"{year} 1인당 지역내총생산(천원)"] / 1_000,  # 천원으로 나누기
+    }))
+
+
+def gdp(year):
+    """선택한 년도의 지역별 지역내총생산과 1인당 지역내총생산."""
+    return _gdp(year, table_version(GDP))
@@ -0,0 +1,115 @@
+"""app2: 지역내총생산, 종사자/사업체 수, 국민총소득 차트."""
+import pandas as pd
+
+import figure_cache
+import query
+from charts import data
+from charts.base import chart
+
+# 1인당 실질 국민총소득 (만 원)
+YEARS = [1960, 1961, 1962, 1963, 1964, 1965, 1966, 1967, 1968, 1969, 1970, 1971, 1972, 1973, 1974, 1975, 1976, 1977, 1978, 1979, 1980, 1981, 1982, 1983, 1984, 1985, 1986, 1987, 1988, 1989, 1990, 1991, 1992, 1993, 1994, 1995, 1996, 1997, 1998, 1999, 2000, 2001, 2002, 2003, 2004, 2005, 2006, 2007, 2008, 2009, 2010, 2011, 2012, 2013, 2014, 2015, 2016, 2017, 2018, 2019, 2020, 2021, 2022, 2023]
+INCOME = [133, 136, 138, 149, 157, 165, 182, 196, 217, 242, 256, 273, 285, 321, 336, 345, 397, 445, 493, 523, 486, 505, 546, 614, 670, 708, 799, 910, 1021, 1100, 1192, 1310, 1375, 1460, 1581, 1702, 1798, 1853, 1699, 1868, 1972, 2034, 2197, 2244, 2331, 2383, 2465, 2592, 2582, 2633, 2808, 2832, 2900, 2998, 3083, 3260, 3391, 3493, 3532, 3532, 3530, 3657, 3639, 3703]
+
+
+@chart(data.GDP, options=lambda: data.GDP_YEARS)
+def gdp_bars(year):
+    """선택 년도의 지역별 GDP와 1인당 GDP 막대그래프."""
+    df = query.fetch('gdp_by_district', year=year)
+    regions = df['지역'].tolist()
+    gdp_values = df['gdp'].tolist()
+    gdp_per_capita_values = df['gdp_per_capita'].tolist()
+
+    # 레이더 차트 (단순화된 형태로 막대 그래프 사용)
+    fig, ax = figure_cache.figure((15, 9))  # 그래프 크기 줄이기
+
+    # 지역내총생산 및 1인당 지역내총생산을 수평 막대그래프로 그리기
+    bars_gdp_per_capita = ax.barh(regions, gdp_per_capita_values, color='red', alpha=0.6, label=f'{year} 1인당 지역내총생산(천원)')
+    bars_gdp = ax.barh(regions, gdp_values, color='blue', alpha=0.6, left=gdp_per_capita_values, label=f'{year} 지역내총생산(백만원)')
+
+    # 수치를 그래프 옆에 표시 (GDP와 1인당 GDP의 비율로 표시)
+    for i, region in enumerate(regions):
+        # 빨간색 막대 옆에 수치 표시
+        ax.text(bars_gdp[i].get_width() + bars_gdp_per_capita[i].get_width() + 0.5, i,
+                f'{gdp_values[i]:,.2f} / {gdp_per_capita_values[i]:,.2f}',
+                va='center', color='black', fontsize=8)
+
+    ax.set_xlabel("금액 (백만원)")
+    ax.set_ylabel("지역")
+    ax.set_title(f'{year} 년 지역별 GDP 및 1인당 GDP')
+
+    ax.legend(loc='upper right')
+    return fig
+
+
+@chart(data.GDP, options=lambda: data.GDP_YEARS)
+def gdp_pie(year):
+    """선택 년도의 지역별 GDP 비율 원형 그래프."""
+    import matplotlib
+
+    df = query.fetch('gdp_by_district', year=year)
+    # 각 지역의 GDP 합계로 비율을 계산
+    gdp_percentages = (df['gdp'] / df['gdp'].sum() * 100).tolist()
+
+    fig_pie, ax_pie = figure_cache.figure((8, 8))  # 그래프 크기 줄이기
+    ax_pie.pie(gdp_percentages, labels=df['지역'].tolist(), autopct='%1.1f%%', startangle=90, colors=matplotlib.colormaps['Paired'].colors)
+    ax_pie.set_title(f'{year} 지역별 GDP 비율')
+    return fig_pie
+
+
+@chart(data.EMPLOYMENT, output='html', options=lambda: data.EMPLOYMENT_YEARS)
+def employment_map(year):
+    """선택 연도의 자치구별 사업체수/종사자수 지도 (folium HTML)."""
+    import point_map
+
+    df1 = query.fetch('employment_by_district', year=year)
+    # 선택된 연도의 사업체수/종사자수 (원 크기는 값에 비례)
+    value = df1['사업체수']
+    employee_value = df1['종사자수']
+    label = (df1['지역'].astype(str)
+             + '<br>사업체수: ' + value.round(2).astype(str)
+             + '<br>종사자수: ' + employee_value.round(2).astype(str))
+    layer = point_map.PointLayer(
+        point_map.points(
+            df1['lat'], df1['lon'],
+            value=value * 0.0010,
+            employee_value=employee_value * 0.00005,
+            label=label,
+        ),
+        # 사업체수는 파란 원, 종사자수는 빨간 원 (거의 투명하게)
+        circles=[
+            {'radius': 'value', 'color': 'blue', 'fill': True, 'fillColor': 'blue', 'fillOpacity': 0.1},
+            {'radius': 'employee_value', 'color': 'red', 'fill': True, 'fillColor': 'red', 'fillOpacity': 0.1},
+        ],
+    )
+    return point_map.render(layer, location=[df1['lat'].mean(), df1['lon'].mean()], zoom_start=12)
+
+
+@chart()
+def gni_line():
+    """1인당 실질 국민총소득 추이."""
+    chart_data = pd.DataFrame({
+        "Year": YEARS,
+        "Income": INCOME
+    })
+
+    # Matplotlib로 차트 그리기
+    fig, ax = figure_cache.figure((10, 6))
+    ax.plot(chart_data["Year"], chart_data["Income"], marker='o', color='b', label="1인당 실질 국민총소득")
+
+    # x축에 10년 간격의 수치만 표시
+    ax.set_xticks([year for year in YEARS if year % 10 == 0])
+    ax.set_xticklabels([str(year) for year in YEARS if year % 10 == 0])
+
+    # 제목과 레이블 설정
+    ax.set_title("1인당 실질 국민총소득 (만 원)", fontsize=14)
+    ax.set_xlabel("연도", fontsize=12)
+    ax.set_ylabel("1인당 실질 국민총소득 (만 원)", fontsize=12)
+
+    # grid 추가
+    ax.grid(True)
+
+    # 10년 간격의 데이터 포인트에 수치 표시
+    for i, txt in enumerate(chart_data["Income"]):
+        if chart_data["Year"][i] % 10 == 0:  # 10년 간격에만 표시
+            ax.annotate(f'{txt}', (chart_data["Year"][i], chart_data["Income"][i]), textcoords="offset points", xytext=(0, 10), ha='center')
+    return fig
@@ -0,0 +1,104 @@
+"""app1: 임대료, 소비자물가지수, 대출금리 차트."""
+import figure_cache
+import query
+from charts import data
+from charts.base import chart
+
+
+@chart(data.RENT, options=lambda: query.values('regions', '지역'))
+def rent_line(region):
+    """선택 지역의 분기별 임대료 라인차트."""
+    import seaborn as sns
+
+    # 선택 지역의 (분기, 값)만 질의로 받음
+    df_selected = query.fetch('rent_by_quarter', region=region)
+
+    # 라인차트 생성
+    fig_line, ax = figure_cache.figure((10, 3))  # 크기 조정
+    sns.lineplot(data=df_selected, x="분기", y="값", marker="o", ax=ax)
+    for i, row in df_selected.iterrows():
+        ax.text(row["분기"], row["값"], f"{row['값']:.2f}", ha="center", va="bottom", fontsize=9)
+    ax.set_xlabel("Quarterly")
+    ax.set_ylabel("1000won/m2")
+    ax.tick_params(axis='x', labelrotation=45)
+    return fig_line
+
+
+@chart(data.RENT, output='html', options=lambda: query.values('rent_quarters', '분기'))
+def rent_map(quarter):
+    """선택 분기의 지역별 임대료 지도 (folium HTML)."""
+    import point_map
+
+    df1 = query.fetch('rent_by_region', quarter=quarter)
+    # 선택된 분기의 값으로 원 크기와 라벨을 열 단위로 한 번에 계산
+    value = df1['값']
+    layer = point_map.PointLayer(
+        point_map.points(
+            df1['lat'], df1['lon'],
+            radius=value * 1.3,  # 원 크기 축소
+            label=df1['지역'].astype(str) + ': ' + value.round(2).astype(str),  # 소수점 2자리
+        ),
+        # 원 테두리/내부 색깔
+        circles=[{'radius': 'radius', 'color': 'red', 'fill': True, 'fillColor': 'red', 'fillOpacity': 0.6}],
+    )
+    return point_map.render(layer, location=[df1['lat'].mean(), df1['lon'].mean()], zoom_start=6)
+
+
+@chart(data.RENT)
+def rent_minmax():
+    """지역별 임대료 최대값/최소값 막대그래프."""
+    extremes = query.fetch('rent_extremes')
+
+    # 막대그래프 생성
+    fig, ax = figure_cache.figure((8, 4))  # 크기 줄이기
+
+    # 최고값과 최소값을 하나의 그래프에 표시
+    bar_width = 0.35
+    index = range(len(extremes))
+
+    ax.bar(index, extremes["최고값"], bar_width, label="Maxi", color='green')
+    ax.bar([i + bar_width for i in index], extremes["최소값"], bar_width, label="Mini", color='red')
+
+    # 그래프 스타일 설정
+    ax.set_xlabel("Area")
+    ax.set_ylabel("1000won/m2")
+    ax.set_xticks([i + bar_width / 2 for i in index])
+    ax.set_xticklabels(extremes["영어지역"], rotation=45)  # X축 라벨을 영어로 변경
+    ax.legend()
+    return fig
+
+
+@chart(data.CPI, data.LOAN)
+def cpi_vs_loan():
+    """소비자물가지수와 대출금리 이중 축 그래프."""
+    import seaborn as sns
+
+    물가 = query.fetch('prices')
+    대출금리 = query.fetch('loan_rates')
+
+    # 그래프 크기 설정 (가로 10, 세로 3)
+    fig_cpi, ax1 = figure_cache.figure((10, 4))
+
+    # 첫 번째 y축: 소비자물가지수
+    sns.lineplot(x='날짜', y='음식 및 숙박', data=물가, ax=ax1, color='blue', label='Restaurant and Accommodation')
+    sns.lineplot(x='날짜', y='의복·신발', data=물가, ax=ax1, color='orange', label='Clothes and Shoes')
+
+    ax1.set_xlabel('Date')
+    ax1.set_ylabel('CPI', color='blue')
+    ax1.tick_params(axis='y', labelcolor='blue')
+    ax1.legend(loc='upper left')
+
+    # 두 번째 y축: 대출금리
+    ax2 = ax1.twinx()
+    sns.lineplot(x='날짜', y='대출금리', data=대출금리, ax=ax2, color='red', label='Loan Rate')
+    ax2.set_ylabel('Loan Rate (%)', color='red')
+    ax2.tick_params(axis='y', labelcolor='red')
+    ax2.legend(loc='upper right')
+
+    # x축 값 10개마다 표시
+    ax1.set_xticks(ax1.get_xticks()[::10])  # 10개마다 x축 값 표시
+    # x축 값 기울이기 (twinx 뒤의 plt.xticks는 숨겨진 ax2 눈금에 적용되어 효과가 없었음)
+    for label in ax1.get_xticklabels():
+        label.set_rotation(45)
+        label.set_horizontalalignment('right')
+    return fig_cpi
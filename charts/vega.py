@@ -0,0 +1,113 @@
+"""단순한 선/막대 차트의 Altair(Vega-Lite) 버전.
+
+서버에서 PNG로 그리지 않고 명세와 데이터(수십 행)만 보내 브라우저가 그린다.
+DASHBOARD_CHART_BACKENDS로 차트마다 matplotlib 버전과 바꿔 쓸 수 있다 (charts.base 참고).
+"""
+import altair as alt
+import pandas as pd
+
+import query
+from charts.closure import district_closed_stores, district_closure, dong_density
+from charts.economy import INCOME, YEARS, gni_line
+from charts.rent import cpi_vs_loan, rent_line, rent_minmax
+
+# matplotlib 버전의 figsize(인치)와 비슷한 높이 (픽셀)
+HEIGHT = 300
+
+
+def _quarter_axis(title):
+    return alt.X('분기:O', sort=None, title=title, axis=alt.Axis(labelAngle=-45))
+
+
+@rent_line.variant('vega')
+def rent_line_vega(region):
+    values = query.fetch('rent_by_quarter', region=region)
+    base = alt.Chart(values).encode(
+        x=_quarter_axis('Quarterly'),
+        y=alt.Y('값:Q', title='1000won/m2', scale=alt.Scale(zero=False)),
+    )
+    return (
+        base.mark_line(point=True)
+        + base.mark_text(dy=-8, fontSize=9).encode(text=alt.Text('값:Q', format='.2f'))
+    ).properties(height=HEIGHT)
+
+
+@rent_minmax.variant('vega')
+def rent_minmax_vega():
+    extremes = query.fetch('rent_extremes')
+    values = pd.DataFrame({
+        'Area': extremes['영어지역'].tolist() * 2,
+        '구분': ['Maxi'] * len(extremes) + ['Mini'] * len(extremes),
+        '값': extremes['최고값'].tolist() + extremes['최소값'].tolist(),
+    })
+    return alt.Chart(values).mark_bar().encode(
+        x=alt.X('Area:N', sort=None, axis=alt.Axis(labelAngle=-45)),
+        xOffset='구분:N',
+        y=alt.Y('값:Q', title='1000won/m2'),
+        color=alt.Color('구분:N', title=None, scale=alt.Scale(domain=['Maxi', 'Mini'], range=['green', 'red'])),
+    ).properties(height=HEIGHT)
+
+
+@cpi_vs_loan.variant('vega')
+def cpi_vs_loan_vega():
+    series = {
+        '음식 및 숙박': 'Restaurant and Accommodation',
+        '의복·신발': 'Clothes and Shoes',
+    }
+    물가 = query.fetch('prices')
+    cpi = pd.concat(
+        [pd.DataFrame({'날짜': 물가['날짜'], '값': 물가[column], '항목': label}) for column, label in series.items()],
+        ignore_index=True,
+    )
+    대출금리 = query.fetch('loan_rates')
+    loan = pd.DataFrame({'날짜': 대출금리['날짜'], '값': 대출금리['대출금리'].astype(float), '항목': 'Loan Rate'})
+
+    color = alt.Color('항목:N', title=None, scale=alt.Scale(
+        domain=[*series.values(), 'Loan Rate'], range=['blue', 'orange', 'red']))
+    x = alt.X('yearmonth(날짜):T', title='Date')
+    # 이중 축: 두 층의 y축을 따로 둠
+    return alt.layer(
+        alt.Chart(cpi).mark_line().encode(x=x, y=alt.Y('값:Q', title='CPI', scale=alt.Scale(zero=False)), color=color),
+        alt.Chart(loan).mark_line().encode(x=x, y=alt.Y('값:Q', title='Loan Rate (%)', scale=alt.Scale(zero=False)), color=color),
+    ).resolve_scale(y='independent').properties(height=HEIGHT)
+
+
+@gni_line.variant('vega')
+def gni_line_vega():
+    values = pd.DataFrame({'Year': YEARS, 'Income': INCOME})
+    base = alt.Chart(values).encode(
+        x=alt.X('Year:Q', title='연도', axis=alt.Axis(format='d', values=[year for year in YEARS if year % 10 == 0])),
+        y=alt.Y('Income:Q', title='1인당 실질 국민총소득 (만 원)'),
+    )
+    # 10년 간격의 데이터 포인트에만 수치 표시
+    labels = base.transform_filter('datum.Year % 10 == 0').mark_text(dy=-10).encode(text='Income:Q')
+    return (base.mark_line(point=True, color='blue') + labels).properties(
+        title='1인당 실질 국민총소득 (만 원)', height=HEIGHT + 60)
+
+
+def _district_line(frame, district, title):
+    values = frame.iloc[:, 0].rename_axis('분기').reset_index(name='값')
+    return alt.Chart(values).mark_line().encode(
+        x=_quarter_axis('년/분기'),
+        y=alt.Y('값:Q', title=title, scale=alt.Scale(zero=False)),
+    ).properties(title=f'{district} {title}', height=HEIGHT)
+
+
+@district_closure.variant('vega')
+def district_closure_vega(district):
+    return _district_line(query.fetch('closure_rate_by_quarter', district=district), district, '폐업률')
+
+
+@district_closed_stores.variant('vega')
+def district_closed_stores_vega(district):
+    return _district_line(query.fetch('closed_stores_by_quarter', district=district), district, '폐업점포수')
+
+
+@dong_density.variant('vega')
+def dong_density_vega(district, year):
+    values = query.fetch('dong_density', district=district, year=year)
+    return alt.Chart(values).mark_bar(color='#f03b20').encode(
+        x=alt.X('인구밀도:Q', title='인구밀도 (명/km²)'),
+        y=alt.Y('행정동:N', sort='-x', title=None),
+        tooltip=['행정동', alt.Tooltip('인구밀도:Q', format=',.0f')],
+    ).properties(title=f'{district} {year} 행정동 인구밀도')
@@ -0,0 +1,198 @@
+import json
+
+import streamlit as st
+
+import density
+import geometry
+import instrument
+from data_loader import BASE_DIR, data_path, file_version, incremental, load_json, load_table, table_version
+
+GEOJSON_NAME = 'seoul_municipalities_geo_simple.json'
+
+# server.enableStaticServing이 켜져 있으면 ./static 폴더가 /app/static/ 으로 제공됨
+STATIC_DIR = BASE_DIR / 'static'
+STATIC_URL = 'app/static/'
+
+# 분기별 지도 캐시 크기 (지도 3종 x 약 22개 분기를 모두 담을 수 있는 크기)
+MAX_FIGURES = 96
+
+# app3의 분기별 지도 설정
+MAPS = {
+    'franchise': {'data': '구별_연도별_프랜차이즈.csv', 'color': '프랜차이즈_점포_수', 'scale': 'reds'},
+    'closure_rate': {'data': '폐업_률.csv', 'color': '폐업_률', 'scale': 'blues'},
+    'closed_stores': {'data': '폐업_점포_수.csv', 'color': '폐업_점포_수', 'scale': 'purples'},
+}
+
+# 인구밀도 지도: 연도별 열을 색으로 사용
+DENSITY = density.DENSITY
+# 사용자 정의 색상 스케일
+DENSITY_SCALE = [
+    [0, "rgb(255,255,204)"],   # 낮은 값: 옅은 노란색
+    [0.2, "rgb(255,237,160)"],
+    [0.4, "rgb(254,178,76)"],
+    [0.6, "rgb(253,141,60)"],
+    [0.8, "rgb(240,59,32)"],
+    [1, "rgb(189,0,38)"]       # 높은 값: 진한 빨간색
+]
+
+MAP_STYLE = {
+    'featureidkey': 'properties.name',
+    'mapbox_style': 'carto-positron',
+    'zoom': 9,
+    'center': {"lat": 37.563383, "lon": 126.996039},
+    'opacity': 0.5,
+}
+
+
+def _static_serving():
+    try:
+        return bool(st.get_option('server.enableStaticServing'))
+    except Exception:
+        return False
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _geometry_tiers(name, version):
+    arrays = geometry.read_artifact(data_path(name))
+    if arrays is None:
+        # `python geometry.py`로 만든 파일이 없거나 오래됐으면 원본에서 바로 계산
+        arrays = geometry.build_tiers(load_json(name))
+    return arrays
+
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _geojson_tier(name, tier, version):
+    return geometry.to_geojson(_geometry_tiers(name, version), tier)
+
+
+def geojson(name=GEOJSON_NAME, zoom=MAP_STYLE['zoom']):
+    """확대 수준에 맞게 단순화한 경계 (GeoJSON dict, 수정 금지)."""
+    tier = geometry.tier_for_zoom(zoom)
+    with instrument.span(f'{name}:{tier}', 'load'):
+        return _geojson_tier(name, tier, file_version(name))
+
+
+@st.cache_resource(show_spinner=False)
+def _publish_geojson(name, tier, version):
+    # 정적 폴더에 써 두면 브라우저가 한 번 받아 캐시하고 모든 지도가 재사용
+    STATIC_DIR.mkdir(exist_ok=True)
+    filename = f'{data_path(name).stem}.{tier}.json'
+    with open(STATIC_DIR / filename, 'w', encoding='utf-8') as f:
+        json.dump(_geojson_tier(name, tier, version), f, ensure_ascii=False, separators=(',', ':'))
+    return STATIC_URL + filename
+
+
+def geojson_source(name=GEOJSON_NAME, zoom=MAP_STYLE['zoom']):
+    """지도에 넣을 GeoJSON: 정적 파일 제공이 켜져 있으면 URL, 아니면 dict 그대로 (확대 수준별 단계)."""
+    if _static_serving():
+        return _publish_geojson(name, geometry.tier_for_zoom(zoom), file_version(name))
+    return geojson(name, zoom)
+
+
+def _split_quarters(df):
+    return {quarter: frame for quarter, frame in df.groupby('년_분기', sort=True)}
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _quarter_frames(name, version):
+    # 분기마다 마스크로 거르지 않도록 한 번에 나눠 둠 (새 분기가 추가되면 그 분기만 더함)
+    return incremental('quarter_frames', name, version,
+                       lambda: _split_quarters(load_table(name)),
+                       lambda frames, rows: {**frames, **_split_quarters(rows)})
+
+
+def quarters(map_id):
+    name = MAPS[map_id]['data']
+    return list(_quarter_frames(name, table_version(name)))
+
+
+def _quarter_version(name, quarter):
+    # 분기 지도는 그 분기 행만 쓰므로 분기가 들어 있는 파일(원본 또는 세그먼트)의 버전이면 충분
+    # (새 분기가 추가돼도 기존 분기 지도는 캐시에 그대로 남음)
+    base, segments = table_version(name)
+    return next((segment for segment in segments if segment[0] == quarter), base)
+
+
+@st.cache_resource(max_entries=MAX_FIGURES, show_spinner=False)
+def _quarter_figure(map_id, quarter, version, static):
+    import plotly.express as px
+
+    config = MAPS[map_id]
+    frame = _quarter_frames(config['data'], table_version(config['data']))[quarter]
+    fig = px.choropleth_mapbox(
+        frame,
+        geojson=geojson_source(),
+        locations='자치구_코드_명',
+        color=config['color'],
+        color_continuous_scale=config['scale'],
+        **MAP_STYLE,
+    )
+    # 레이아웃 업데이트 (컬러바 축 제거)
+    fig.update_layout(width=1500, height=800, coloraxis_showscale=False)
+    return fig
+
+
+def quarter_figure(map_id, quarter):
+    """분기별 지도. 처음 요청된 분기만 만들고 이후에는 캐시에서 바로 꺼낸다."""
+    version = _quarter_version(MAPS[map_id]['data'], quarter)
+    with instrument.span(f'{map_id}_map', 'build'):
+        return _quarter_figure(map_id, quarter, version, _static_serving())
+
+
+@st.cache_resource(max_entries=len(MAPS), show_spinner=False)
+def _animated_figure(map_id, version, static):
+    import plotly.express as px
+
+    config = MAPS[map_id]
+    df = load_table(config['data']).sort_values('년_분기')
+    fig = px.choropleth_mapbox(
+        df,
+        geojson=geojson_source(),
+        locations='자치구_코드_명',
+        color=config['color'],
+        color_continuous_scale=config['scale'],
+        animation_frame='년_분기',
+        # 분기가 바뀌어도 같은 색이 같은 값을 뜻하도록 전체 범위로 고정
+        range_color=(df[config['color']].min(), df[config['color']].max()),
+        **MAP_STYLE,
+    )
+    # 프레임은 색상 값만 바꾸면 되므로 GeoJSON은 첫 trace에만 남김
+    for frame in fig.frames:
+        for trace in frame.data:
+            trace.geojson = None
+    fig.update_layout(width=1500, height=800, coloraxis_showscale=False)
+    return fig
+
+
+def animated_figure(map_id):
+    """모든 분기를 애니메이션 프레임으로 담은 지도 하나.
+
+    슬라이더로 분기를 바꾸는 동작은 브라우저 안에서만 일어나 스크립트가 다시 실행되지 않는다.
+    """
+    version = table_version(MAPS[map_id]['data'])
+    with instrument.span(f'{map_id}_map', 'build'):
+        return _animated_figure(map_id, version, _static_serving())
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _density_figure(year, version, static):
+    import plotly.express as px
+
+    # 자치구마다 소계 한 행만 (행정동 행까지 넣으면 같은 구가 여러 번 그려짐)
+    fig = px.choropleth_mapbox(
+        density.district_frame(year),
+        geojson=geojson_source(),
+        locations='자치구',
+        color=year,
+        color_continuous_scale=DENSITY_SCALE,  # 사용자 정의 색상 스케일 적용
+        **MAP_STYLE,
+    )
+    # 레이아웃 업데이트
+    fig.update_layout(width=1500, height=800)
+    return fig
+
+
+def density_figure(year):
+    """연도별 자치구 인구밀도 지도."""
+    with instrument.span('density_map', 'build'):
+        return _density_figure(year, table_version(DENSITY), _static_serving())
@@ -0,0 +1,198 @@
+"""전국 규모 폐업률 CSV를 나눠 읽으며 바로 집계하는 메모리 상한 로더.
+
+    python chunked.py 전국_폐업률.csv --max-mb 1024
+    python chunked.py 폐업률.csv --chunk-rows 1000     # 작은 파일로 동작 확인
+
+- 원본 행은 한 청크만 메모리에 있다. 청크는 좁은 형식(DTYPES)으로 읽고 바로
+  대시보드가 쓰는 집계로 줄인다: ClosureCube의 집계 단위(rollup.ROLLUPS)별 통계.
+  원본 한 행이 셀(자치구 x 업종 x 분기) 하나라 셀 단위로는 줄지 않으므로 셀 통계는 보관하지 않는다.
+- 자치구, 업종, 년_분기는 청크마다 범주가 달라지므로 파일 전체에서 같은 정수 코드로 바꿔 집계한다.
+- 상한(max_mb)은 로드를 시작할 때보다 늘어난 RSS, 즉 로더 자신이 쓰는 메모리에 적용한다
+  (대시보드 안에서는 Streamlit, 캐시, 미리 그린 그림이 이미 RSS에 들어 있으므로).
+  증가량이 상한의 3/4을 넘으면 부분 집계를 합치고 청크를 절반으로 줄인다.
+  최소 청크에서도 상한을 넘으면 MemoryError. 작은 첫 청크의 행당 메모리로 청크 크기를 상한에 맞춰 시작한다.
+- 끝나면 행 수, 청크 수, 걸린 시간, 최대 RSS를 보고한다 (호스트 메모리 산정용).
+- 폐업률은 float32로 읽지만 합계와 제곱합은 float64로 더한다.
+"""
+import argparse
+import gc
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+import instrument
+from cleaning import READ_OPTIONS
+from rollup import DIMENSIONS, ROLLUPS, STATS, ClosureCube
+
+# 읽을 열과 형식 (큐브 통계에 쓰는 열만)
+DTYPES = {
+    '자치구_코드_명': 'category',
+    '서비스_업종_코드_명': 'category',
+    '년_분기': 'category',
+    '년': 'int16',
+    '분기': 'int16',
+    '폐업_률': 'float32',
+    '폐업_점포_수': 'int32',
+}
+CODED = ['자치구_코드_명', '서비스_업종_코드_명', '년_분기']
+
+MAX_MB = float(os.environ.get('DASHBOARD_LOADER_MB') or 1024)
+CHUNK_ROWS = 500_000
+MIN_CHUNK_ROWS = 10_000
+# 부분 집계가 이만큼 쌓이면 합쳐서 하나로
+COMBINE_EVERY = 8
+
+
+class Vocabulary:
+    """청크마다 다른 범주를 파일 전체에서 같은 정수 코드로 맞춘다."""
+
+    def __init__(self, column):
+        self.column = column
+        self.values = []
+        self._codes = {}
+
+    def encode(self, series):
+        codes = series.cat.codes.to_numpy()
+        if (codes < 0).any():
+            raise ValueError(f'{self.column}: 빈 값 {int((codes < 0).sum())}개')
+        # 청크의 범주 -> 전체 코드 표 (범주 수만큼만 파이썬에서 처리)
+        table = np.array([self._code(value) for value in series.cat.categories], dtype=np.int32)
+        return table[codes]
+
+    def _code(self, value):
+        if value not in self._codes:
+            self._codes[value] = len(self.values)
+            self.values.append(value)
+        return self._codes[value]
+
+    def decode(self, codes):
+        return np.array(self.values, dtype=object)[codes]
+
+
+def _chunk_stats(chunk, vocabularies, rollups):
+    # 집계 단위별 합계 (코드로 묶고 이름은 마지막에 한 번만 되돌림)
+    values = chunk['폐업_률'].to_numpy(dtype='float64')
+    frame = pd.DataFrame({
+        **{column: vocabularies[column].encode(chunk[column]) if column in vocabularies else chunk[column].to_numpy()
+           for column in DIMENSIONS},
+        'count': np.ones(len(chunk), dtype=np.int64),
+        'sum': values,
+        'sumsq': values * values,
+        '폐업_점포_수': chunk['폐업_점포_수'].to_numpy(dtype='int64'),
+    })
+    return {by: frame.groupby(list(by), sort=False)[STATS].sum() for by in rollups}
+
+
+def _combine(partials):
+    if len(partials) == 1:
+        return partials[0]
+    combined = {}
+    for key, first in partials[0].items():
+        frames = pd.concat([partial[key] for partial in partials])
+        combined[key] = frames.groupby(level=list(first.index.names), sort=False).sum()
+    return combined
+
+
+def _decode(stats, vocabularies):
+    frame = stats.reset_index()
+    for column in stats.index.names:
+        if column in vocabularies:
+            frame[column] = vocabularies[column].decode(frame[column].to_numpy())
+        else:
+            # 년/분기 인덱스는 원본과 같은 int64 (ingest로 더하는 행과 맞춤)
+            frame[column] = frame[column].astype('int64')
+    return frame.set_index(list(stats.index.names)).sort_index()
+
+
+class ChunkedClosure:
+    """청크 로드 결과: 큐브와 보고용 수치."""
+
+    def __init__(self, stats, rows, chunks, chunk_rows, seconds):
+        self.cube = ClosureCube.from_stats(stats)
+        self.rows = rows
+        self.chunks = chunks
+        self.chunk_rows = chunk_rows
+        self.seconds = seconds
+        self.peak_rss_mb = instrument.peak_rss_mb()
+
+    def report(self):
+        rss = f'{self.peak_rss_mb:.0f}MB' if self.peak_rss_mb is not None else '알 수 없음'
+        return (f'{self.rows:,}행, 청크 {self.chunks}개 (청크 크기 {self.chunk_rows:,}행), '
+                f'{self.seconds:.1f}초, 최대 RSS {rss}')
+
+
+def _growth_mb(base):
+    rss = instrument.rss_mb()
+    return None if rss is None or base is None else rss - base
+
+
+def _over(base, limit):
+    growth = _growth_mb(base)
+    return growth is not None and growth > limit
+
+
+def load(path, max_mb=MAX_MB, chunk_rows=CHUNK_ROWS, rollups=ROLLUPS):
+    """path를 chunk_rows행씩 읽어 rollups 단위로 집계한다. 로드 중 늘어난 RSS가 max_mb를 넘지 않도록 청크 크기를 줄인다.
+
+    max_mb가 None이면 상한 없이 chunk_rows행씩 읽는다.
+    """
+    start = time.perf_counter()
+    base = instrument.rss_mb()
+    vocabularies = {column: Vocabulary(column) for column in CODED}
+    partials = []
+    rows = chunks = 0
+    options = {**READ_OPTIONS, 'usecols': list(DTYPES), 'dtype': DTYPES, 'encoding': 'utf-8-sig'}
+    with pd.read_csv(path, iterator=True, **options) as reader:
+        while True:
+            try:
+                # 첫 청크는 행당 메모리를 재기 위한 작은 청크
+                chunk = reader.get_chunk(min(chunk_rows, MIN_CHUNK_ROWS) if chunks == 0 else chunk_rows)
+            except StopIteration:
+                break
+            if chunks == 0 and max_mb is not None:
+                # 청크 하나가 상한의 1/8을 넘지 않도록 (파싱 중 임시 메모리 포함 여유)
+                row_bytes = chunk.memory_usage(deep=True).sum() / max(len(chunk), 1)
+                chunk_rows = min(chunk_rows, max(MIN_CHUNK_ROWS, int(max_mb * 1024 * 1024 / 8 / row_bytes)))
+            partials.append(_chunk_stats(chunk, vocabularies, rollups))
+            rows += len(chunk)
+            chunks += 1
+            del chunk
+            if len(partials) >= COMBINE_EVERY:
+                partials = [_combine(partials)]
+            if max_mb is not None and _over(base, max_mb * 0.75):
+                partials = [_combine(partials)]
+                gc.collect()
+                if _over(base, max_mb) and chunk_rows <= MIN_CHUNK_ROWS:
+                    raise MemoryError(f'메모리 상한 {max_mb:.0f}MB 초과 '
+                                      f'(로더 증가분 {_growth_mb(base):.0f}MB, {rows:,}행 처리)')
+                chunk_rows = max(min(MIN_CHUNK_ROWS, chunk_rows), chunk_rows // 2)
+    if not partials:
+        raise ValueError(f'{path}: 행이 없음')
+
+    stats = {by: _decode(frame, vocabularies) for by, frame in _combine(partials).items()}
+    return ChunkedClosure(stats, rows, chunks, chunk_rows, time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='폐업률 CSV를 청크로 읽어 집계하고 최대 RSS 보고')
+    parser.add_argument('path', help='폐업률 형식의 CSV')
+    parser.add_argument('--max-mb', type=float, default=MAX_MB, help='메모리 상한 (로드 중 늘어난 RSS, MB)')
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS, help='시작 청크 크기 (행)')
+    args = parser.parse_args()
+
+    try:
+        result = load(args.path, args.max_mb, args.chunk_rows)
+    except MemoryError as error:
+        print(error)
+        return 1
+    print(result.report())
+    quarters = result.cube.rollup('년_분기')
+    districts = result.cube.rollup('자치구_코드_명', '년_분기').index.get_level_values(0)
+    print(f'년_분기 {len(quarters)}개 ({quarters.index[0]} ~ {quarters.index[-1]}), 자치구 {districts.nunique()}개')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
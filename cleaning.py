@@ -0,0 +1,51 @@
+import re
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# 지역/자치구 이름 열은 범주형으로 저장
+CATEGORY_COLUMNS = ('지역', '자치구', '자치구_코드_명', '서비스_업종_코드_명', '행정동')
+
+# '2019', '2019 사업체수', '2021 1인당 지역내총생산(천원)' 처럼 연도로 시작하는 열
+YEAR_COLUMN = re.compile(r'^\d{4}(\D|$)')
+MISSING = '-'
+
+# CSV 파서 단계에서 천 단위 콤마와 '-'를 처리 (문자열 후처리가 필요 없음)
+READ_OPTIONS = {'thousands': ',', 'na_values': [MISSING]}
+
+
+def year_columns(df):
+    return [column for column in df.columns if YEAR_COLUMN.match(str(column))]
+
+
+def to_float64(df, columns=None):
+    """연도 열 전체를 한 번에 float64로 변환한다 ("39,679" -> 39679.0, '-' -> NaN).
+
+    열마다, 값마다 `.replace(',', '')`를 호출하지 않고 문자열 열을 하나의
+    Arrow 배열로 펼쳐 콤마 제거와 숫자 변환을 C++ 커널로 한 번씩만 수행한다.
+    """
+    columns = year_columns(df) if columns is None else list(columns)
+    text_columns = [column for column in columns if df[column].dtype == object]
+    df = df.copy()
+    if text_columns:
+        values = pa.array(df[text_columns].to_numpy().ravel(), type=pa.string(), from_pandas=True)
+        values = pc.replace_substring(pc.utf8_trim_whitespace(values), ',', '')
+        values = pc.if_else(pc.is_in(values, pa.array([MISSING, ''])), pa.scalar(None, pa.string()), values)
+        numbers = pc.cast(values, pa.float64()).to_numpy(zero_copy_only=False)
+        numbers = numbers.reshape(len(df), len(text_columns))
+        df[text_columns] = pd.DataFrame(numbers, index=df.index, columns=text_columns)
+    for column in columns:
+        if column not in text_columns:
+            df[column] = df[column].astype('float64')
+    return df
+
+
+def clean(df):
+    """헤더 정리, 연도 열 숫자 변환, 지역명 범주형 변환."""
+    df = df.rename(columns=lambda c: str(c).lstrip('\ufeff').strip())
+    df = to_float64(df)
+    for column in CATEGORY_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype('category')
+    return df
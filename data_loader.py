@@ -0,0 +1,149 @@
+import json
+import os
+import threading
+from collections import Counter
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+import instrument
+import snapshots
+
+# 앱 파일 위치, 데이터 파일은 기본적으로 같은 폴더
+# (벤치마크 등에서 다른 데이터로 실행할 때는 DASHBOARD_DATA_DIR 환경변수로 지정)
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR = Path(os.environ.get('DASHBOARD_DATA_DIR') or BASE_DIR)
+
+# 실제로 파일을 읽은 횟수 (캐시 적중은 세지 않음)
+read_counts = Counter()
+
+
+def data_path(name):
+    return DATA_DIR / name
+
+
+def file_version(name):
+    # 파일이 바뀌면 캐시가 새로 읽도록 (수정시각, 크기)를 버전으로 사용
+    stat = os.stat(data_path(name))
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def table_version(name):
+    # load_table 결과의 버전: 파일 버전 + ingest.py로 추가된 분기 세그먼트
+    return (file_version(name), snapshots.segment_versions(data_path(name)))
+
+
+def freeze(df):
+    # 모든 열을 읽기 전용 배열로 만들어 세션 간 공유 중 수정되지 않도록 함
+    columns = {}
+    for column in df.columns:
+        if isinstance(df[column].dtype, pd.CategoricalDtype):
+            # 범주형은 새 값을 넣을 수 없으므로 그대로 사용
+            columns[column] = df[column].array
+            continue
+        values = df[column].to_numpy(copy=False)
+        values.flags.writeable = False
+        columns[column] = values
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
+def _snapshot_version(name):
+    path = snapshots.snapshot_path(data_path(name))
+    return file_version(path) if path.exists() else None
+
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def _read_table(path, version, snapshot_version):
+    read_counts[path] += 1
+    df = snapshots.read_snapshot(path)
+    if df is None:
+        # 스냅샷이 없거나 CSV보다 오래되면 CSV를 읽어 같은 방식으로 정제
+        df = snapshots.read_csv(path)
+    return freeze(df)
+
+
+def append_rows(df, rows):
+    """df 뒤에 rows를 붙인 새 읽기 전용 표. 범주형 열은 새 값만 범주에 더해 기존 코드를 유지한다."""
+    columns = {}
+    for column in df.columns:
+        dtype = df[column].dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            added = pd.Index(rows[column].dropna().unique()).difference(dtype.categories)
+            dtype = pd.CategoricalDtype(dtype.categories.append(added))
+        columns[column] = pd.concat([df[column].astype(dtype), rows[column].astype(dtype)], ignore_index=True)
+    return freeze(pd.DataFrame(columns))
+
+
+def segment_rows(name, labels):
+    """추가된 세그먼트들의 행. 원본 CSV가 바뀌어 무시되는 세그먼트는 빠지고, 하나도 없으면 None."""
+    frames = [snapshots.read_segment(data_path(name), label) for label in labels]
+    frames = [frame for frame in frames if frame is not None]
+    return pd.concat(frames, ignore_index=True) if frames else None
+
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _read_segments(path, version, snapshot_version):
+    df = _read_table(path, version[0], snapshot_version)
+    rows = segment_rows(Path(path).name, [label for label, *_ in version[1]])
+    return df if rows is None else append_rows(df, rows)
+
+
+def load_table(name):
+    """정제된 데이터셋을 반환한다 (숫자 열은 숫자형, 지역명은 범주형).
+
+    `python snapshots.py`로 만든 스냅샷이 최신이면 메모리 매핑으로 읽고,
+    아니면 CSV를 읽어 정제한다. `ingest.py`로 추가한 분기 세그먼트가 있으면 뒤에 붙인다.
+    프로세스당 한 번만 읽어 모든 세션이 같은 DataFrame을 공유하며, 읽기 전용이므로
+    값을 바꾸거나 열을 추가하려면 `.copy()` 후 사용한다.
+    """
+    with instrument.span(name, 'load'):
+        path = str(data_path(name))
+        version = table_version(name)
+        if not version[1]:
+            return _read_table(path, version[0], _snapshot_version(name))
+        return _read_segments(path, version, _snapshot_version(name))
+
+
+# 종류별로 마지막에 만든 (버전, 결과): 세그먼트만 늘었으면 여기서 이어서 만든다
+_latest = {}
+_latest_lock = threading.Lock()
+
+
+def incremental(kind, name, version, build, extend):
+    """table_version(name)이 version일 때의 파생 결과(집계, 인덱스 등)를 만든다.
+
+    직전 결과와 원본 파일이 같고 세그먼트만 뒤에 추가됐으면 extend(직전 결과, 새 행)으로
+    새 분기 행만 반영하고, 아니면 build()로 전부 다시 만든다. 직전 결과를 쓰는 세션이
+    남아 있을 수 있으므로 extend는 직전 결과를 고치지 않고 새 객체를 반환해야 한다.
+    """
+    with _latest_lock:
+        previous = _latest.get((kind, name))
+    value = None
+    if previous is not None:
+        (old_base, old_segments), old_value = previous
+        base, segments = version
+        added = segments[len(old_segments):]
+        if (old_base, old_segments) == version:
+            value = old_value
+        elif old_base == base and segments[:len(old_segments)] == old_segments and added:
+            rows = segment_rows(name, [label for label, *_ in added])
+            value = old_value if rows is None else extend(old_value, rows)
+    if value is None:
+        value = build()
+    with _latest_lock:
+        _latest[(kind, name)] = (version, value)
+    return value
+
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _read_json(path, version):
+    read_counts[path] += 1
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_json(name):
+    """GeoJSON 등 JSON 파일을 프로세스당 한 번만 읽어 공유한다 (수정 금지)."""
+    with instrument.span(name, 'load'):
+        return _read_json(str(data_path(name)), file_version(name))
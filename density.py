@@ -0,0 +1,69 @@
+import streamlit as st
+
+from data_loader import freeze, load_table, table_version
+
+DENSITY = '서울시 동별 인구밀도.csv'
+SUBTOTAL = '소계'
+
+
+class DensityTable:
+    """인구밀도 표를 자치구 소계 행과 행정동 행으로 로드 시 한 번만 나눠 보관.
+
+    원본은 자치구마다 '소계' 한 행과 행정동 행들이 섞여 있어 그대로 지도에 넣으면
+    한 자치구가 여러 번 그려진다. 자치구 지도는 소계만, 행정동 차트는 행정동 행만 쓴다.
+    '-'(결측)는 로드 시 NaN으로 바뀌며, 값이 있는 연도도 여기서 한 번만 계산한다.
+    """
+
+    def __init__(self, df):
+        self.year_columns = [column for column in df.columns if column not in ('자치구', '행정동')]
+        df = df.assign(자치구=df['자치구'].astype(str), 행정동=df['행정동'].astype(str))
+        subtotal = df['행정동'] == SUBTOTAL
+        self.districts = df[subtotal].set_index('자치구')[self.year_columns]
+        # 같은 이름의 행정동이 다른 구에 있으므로 (자치구, 행정동)으로 구분
+        self.dongs = df[~subtotal].set_index(['자치구', '행정동']).sort_index()[self.year_columns]
+        # 2023년은 행정동 값이 모두 '-'라 제외 (자치구 소계만 있음)
+        self.years = [year for year in self.year_columns
+                      if self.districts[year].notna().all() and self.dongs[year].notna().any()]
+
+    def district_frame(self, year):
+        # px.choropleth_mapbox에 넣을 (자치구, 연도 값) 표
+        return freeze(self.districts[[year]].reset_index())
+
+    def dong_frame(self, district, year):
+        values = self.dongs.loc[district, year].dropna().sort_values(ascending=False)
+        return freeze(values.rename_axis('행정동').reset_index(name='인구밀도'))
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _density_table(version):
+    return DensityTable(load_table(DENSITY))
+
+
+def density_table():
+    return _density_table(table_version(DENSITY))
+
+
+def years():
+    """자치구와 행정동 값이 모두 있는 연도."""
+    return density_table().years
+
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _district_frame(year, version):
+    return _density_table(version).district_frame(year)
+
+
+def district_frame(year):
+    """연도별 자치구 인구밀도 (소계 행)."""
+    return _district_frame(year, table_version(DENSITY))
+
+
+@st.cache_resource(max_entries=128, show_spinner=False)
+def _dong_frame(district, year, version):
+    return _density_table(version).dong_frame(district, year)
+
+
+def dong_frame(district, year):
+    """자치구 안 행정동별 인구밀도 (높은 순)."""
+    return _dong_frame(district, year, table_version(DENSITY))
+
@@ -0,0 +1,214 @@
+import io
+import threading
+from collections import OrderedDict
+
+import streamlit as st
+import streamlit.components.v1
+
+import fonts
+import instrument
+import render_pool
+from data_loader import table_version
+
+# 렌더링된 이미지 캐시 한도 (프로세스 전체에서 공유)
+MAX_BYTES = 64 * 1024 * 1024
+MAX_ENTRIES = 512
+
+# 크기별로 남겨 두고 재사용하는 빈 Figure 수
+SPARE_FIGURES = 2
+SUBPLOT_PARAMS = ('left', 'right', 'bottom', 'top', 'wspace', 'hspace')
+
+_spare_lock = threading.Lock()
+_spare_figures = {}
+
+
+def _size(value):
+    # HTML(str)은 글자 수가 아니라 UTF-8 바이트 수로 (한글 라벨은 글자당 3바이트)
+    return len(value.encode()) if isinstance(value, str) else len(value)
+
+
+class FigureCache:
+    """렌더링된 그림(bytes)을 담는 LRU 캐시. 개수와 총 바이트 수를 모두 제한한다."""
+
+    def __init__(self, max_bytes=MAX_BYTES, max_entries=MAX_ENTRIES):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key, value):
+        size = _size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old[1]
+            self._items[key] = (value, size)
+            self.total_bytes += size
+            # 오래 안 쓴 항목부터 제거
+            while self.total_bytes > self.max_bytes or len(self._items) > self.max_entries:
+                _, (_, evicted) = self._items.popitem(last=False)
+                self.total_bytes -= evicted
+
+    def __contains__(self, key):
+        # 적중/미스 집계 없이 있는지만 확인
+        with self._lock:
+            return key in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+
+@st.cache_resource(show_spinner=False)
+def get_cache():
+    return FigureCache()
+
+
+def data_version(*names):
+    return tuple(table_version(name) for name in names)
+
+
+def figure(figsize):
+    """plt.subplots 대신 사용하는 (Figure, Axes).
+
+    pyplot 상태 머신(전역 레지스트리)에 등록되지 않는 Figure라 닫지 않아도 참조가 사라지면 해제된다.
+    render()가 저장한 뒤 비워 두므로 같은 크기의 다음 차트가 그대로 다시 쓴다.
+    """
+    from matplotlib.figure import Figure
+
+    with _spare_lock:
+        spare = _spare_figures.get(tuple(figsize))
+        fig = spare.pop() if spare else None
+    if fig is None:
+        fig = Figure(figsize=figsize)
+    return fig, fig.add_subplot()
+
+
+def release(fig):
+    """다 쓴 Figure 정리. pyplot으로 만든 것은 닫고, figure()로 만든 것은 비워서 재사용 목록에 넣는다."""
+    import matplotlib
+
+    if fig.canvas.manager is not None:
+        import matplotlib.pyplot as plt
+        plt.close(fig)
+        return
+    fig.clear()
+    # tight_layout 등으로 바뀐 여백을 기본값으로 되돌림
+    fig.subplots_adjust(**{name: matplotlib.rcParams[f'figure.subplot.{name}'] for name in SUBPLOT_PARAMS})
+    with _spare_lock:
+        spare = _spare_figures.setdefault(tuple(fig.get_size_inches()), [])
+        if len(spare) < SPARE_FIGURES:
+            spare.append(fig)
+
+
+def render(fig, fmt='png'):
+    # st.pyplot과 같은 옵션으로 저장하고, 저장에 실패해도 Figure는 정리
+    buffer = io.BytesIO()
+    try:
+        fig.savefig(buffer, format=fmt, bbox_inches='tight', dpi=200)
+    finally:
+        release(fig)
+    return buffer.getvalue()
+
+
+def make_key(chart_id, key=(), data=()):
+    return (chart_id, tuple(key), data_version(*data))
+
+
+def cached(chart_id, build, key=(), data=()):
+    """(차트 id, 위젯 값, 데이터 버전)이 같으면 build()를 다시 실행하지 않고
+    캐시된 결과를 반환한다. build는 bytes 또는 str을 반환해야 한다."""
+    cache_key = make_key(chart_id, key, data)
+    cache = get_cache()
+    value = cache.get(cache_key)
+    if value is None:
+        value = build()
+        cache.put(cache_key, value)
+    return value
+
+
+def cached_figure(chart_id, build, key=(), data=(), fmt='png'):
+    # build는 matplotlib Figure를 반환하고, 렌더링된 이미지를 캐시
+    def draw():
+        # 폰트 설정은 실제로 그림을 그릴 때 한 번만
+        fonts.setup()
+        return render(build(), fmt)
+
+    return cached(chart_id, draw, (*key, fmt), data)
+
+
+def html(chart_id, build, key=(), data=(), width=None, height=None):
+    """components.html 대신 사용: build()가 만든 HTML(folium 지도 등)을 캐시해 전송한다."""
+    with instrument.span(chart_id, 'render') as span:
+        value = cached(chart_id, build, key, data)
+        span.output_bytes = len(value.encode())
+        return st.components.v1.html(value, width=width, height=height)
+
+
+def pyplot(chart_id, build, key=(), data=(), use_container_width=True):
+    """st.pyplot 대신 사용: 캐시된 PNG를 그대로 전송한다."""
+    with instrument.span(chart_id, 'render') as span:
+        image = cached_figure(chart_id, build, key, data)
+        span.output_bytes = len(image)
+        return st.image(image, use_container_width=use_container_width)
+
+
+def vega_chart(chart, args, use_container_width=True):
+    """Altair 차트: 서버에서 그리지 않고 명세와 데이터만 보낸다 (만드는 비용이 작아 캐시하지 않음)."""
+    with instrument.span(chart.chart_id, 'render') as span:
+        spec = chart(*args)
+        if instrument.measure_output():
+            span.output_bytes = len(spec.to_json())
+        return st.altair_chart(spec, use_container_width=use_container_width)
+
+
+def chart_key(chart, args, fmt='png'):
+    """show()가 쓰는 캐시 키 (pyplot/html과 같은 형식)."""
+    key = (*args, fmt) if chart.output == 'image' else args
+    return make_key(chart.chart_id, key, chart.data)
+
+
+def _display(container, chart, value, options):
+    # 풀에서 받은 결과를 미리 잡아 둔 자리에 채움
+    with container:
+        if chart.output == 'image':
+            return st.image(value, use_container_width=options.get('use_container_width', True))
+        return st.components.v1.html(value, width=options.get('width'), height=options.get('height'))
+
+
+def show(chart, *args, **options):
+    """charts 패키지의 빌더를 출력 종류에 맞게 캐시해 표시한다.
+
+    캐시 키는 (chart_id, 인자, 빌더가 쓰는 데이터 파일 버전)이며 options는 표시 옵션(width 등)이다.
+    렌더 풀이 켜져 있고 캐시에 없으면 자리만 잡고 풀에 넘긴다 (페이지 끝의 render_pool.flush()가 채움).
+    차트에 설정된 백엔드 버전이 있으면 그것으로 그린다 (charts.base.select).
+    """
+    chart = chart.select()
+    if chart.output == 'vega':
+        return vega_chart(chart, args, **options)
+    if render_pool.enabled() and chart.output in render_pool.POOL_OUTPUTS:
+        key = chart_key(chart, args)
+        if key not in get_cache():
+            placeholder = st.empty()
+            if render_pool.submit(chart, args, key, lambda value: _display(placeholder, chart, value, options)):
+                return placeholder
+    if chart.output == 'image':
+        return pyplot(chart.chart_id, lambda: chart(*args), args, chart.data, **options)
+    if chart.output == 'html':
+        return html(chart.chart_id, lambda: chart(*args), args, chart.data, **options)
+    # plotly Figure는 choropleth 모듈이 (인자, 데이터 버전)으로 캐시해 둔 객체
+    return instrument.plotly_chart(chart(*args), chart.chart_id, **options)
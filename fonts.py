@@ -0,0 +1,92 @@
+"""차트 한글 폰트 준비.
+
+    python fonts.py          # matplotlib 폰트 캐시를 미리 만들고 한글 글리프 검사 (이미지 빌드 시)
+    python fonts.py --check  # 검사만 (실패하면 종료 코드 1)
+"""
+import argparse
+import threading
+from pathlib import Path
+
+# 저장소에 포함된 폰트 (시스템 폰트에 의존하지 않도록 직접 등록)
+FONT_PATH = Path(__file__).resolve().parent / 'NanumGothic.ttf'
+FONT_FAMILY = 'NanumGothic'
+
+# 차트 제목/축에 쓰이는 글자들로 글리프 검사
+SAMPLE_TEXT = '한글 폐업률 임대료 년/분기 자치구'
+
+_lock = threading.Lock()
+_ready = False
+
+
+def register():
+    """번들 폰트를 font_manager에 등록하고 등록된 family 이름을 반환한다."""
+    from matplotlib import font_manager
+
+    # fontManager를 처음 불러올 때 폰트 캐시(fontlist-*.json)가 없으면 새로 만듦
+    font_manager.fontManager.addfont(str(FONT_PATH))
+    return font_manager.FontProperties(fname=str(FONT_PATH)).get_name()
+
+
+def setup():
+    """한글 폰트 설정. 프로세스마다 한 번만 적용하고 이후 호출은 바로 반환한다."""
+    global _ready
+    if _ready:
+        return
+    with _lock:
+        if _ready:
+            return
+        import matplotlib
+
+        family = register() if FONT_PATH.exists() else FONT_FAMILY
+        matplotlib.rcParams['font.family'] = family
+        matplotlib.rcParams['axes.unicode_minus'] = False
+        _ready = True
+
+
+def check(text=SAMPLE_TEXT):
+    """설정된 폰트가 번들 폰트로 찾아지고 text의 모든 글자를 그릴 수 있는지 검사한다.
+
+    글자가 빠진 폰트로 떨어지면 차트에 네모(tofu)가 찍히므로 RuntimeError를 낸다.
+    """
+    from matplotlib import font_manager
+    from matplotlib.ft2font import FT2Font
+
+    setup()
+    try:
+        path = font_manager.findfont(font_manager.FontProperties(family=FONT_FAMILY), fallback_to_default=False)
+    except ValueError as e:
+        raise RuntimeError(f'{FONT_FAMILY} 폰트를 찾을 수 없음') from e
+    font = FT2Font(path)
+    missing = sorted({char for char in text if not char.isspace() and font.get_char_index(ord(char)) == 0})
+    if missing:
+        raise RuntimeError(f'{Path(path).name}에 없는 글자: {"".join(missing)}')
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='matplotlib 한글 폰트 준비')
+    parser.add_argument('--check', action='store_true', help='폰트 검사만 수행')
+    args = parser.parse_args()
+
+    if not args.check:
+        # 폰트 캐시를 만들고 한 번 그려 두어 첫 화면 렌더링 시 재빌드가 없도록 함
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+
+        setup()
+        fig, ax = plt.subplots()
+        ax.set_title(SAMPLE_TEXT)
+        fig.canvas.draw()
+        plt.close(fig)
+    try:
+        path = check()
+    except RuntimeError as e:
+        print(f'font check failed: {e}')
+        return 1
+    print(f'{FONT_FAMILY}: {path}')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,264 @@
+"""지도 경계(GeoJSON)를 확대 수준별로 단순화해 압축된 배열로 저장한다.
+
+    python geometry.py            # 모든 GeoJSON의 단계별 경계 생성 (바뀐 파일만)
+    python geometry.py --force    # 전부 다시 생성
+    python geometry.py --check    # 오래된 파일 목록만 출력
+
+- 이웃한 구역이 함께 쓰는 경계선(arc)을 한 번만 Douglas-Peucker로 단순화하므로
+  단순화해도 구역 사이에 틈이나 겹침이 생기지 않는다 (TopoJSON과 같은 방식).
+- 좌표는 1e-5도(약 1m) 격자 정수로 양자화해 snapshots/<이름>.geo.npz에 압축 저장한다.
+- 단계(TIERS)마다 허용 오차와 소수점 자리수가 다르며, 지도의 확대 수준으로 단계를 고른다.
+  GeoJSON으로 풀 때 소수점 자리수를 줄이므로 지도마다 보내는 JSON도 작아진다.
+- 원본이 바뀌면(수정시각, 크기) 저장된 파일은 무시되고 메모리에서 다시 계산한다.
+"""
+import argparse
+import io
+import json
+import os
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent
+SNAPSHOT_DIR = BASE_DIR / 'snapshots'
+
+# 단순화 방식이나 저장 형식이 바뀌면 올려서 기존 파일을 무효화
+GEOMETRY_FORMAT = 1
+
+# 양자화 격자 (도)
+QUANTUM = 1e-5
+
+# 확대 수준별 단계: max_zoom 이하에서 사용, tolerance는 Douglas-Peucker 허용 오차(도)
+# (zoom 9에서 화면 1px이 약 0.001도)
+TIERS = {
+    'low': {'max_zoom': 10, 'tolerance': 0.001, 'digits': 4},
+    'mid': {'max_zoom': 12, 'tolerance': 0.0002, 'digits': 5},
+    'full': {'max_zoom': None, 'tolerance': 0.0, 'digits': 5},
+}
+
+
+def tier_for_zoom(zoom):
+    for tier, config in TIERS.items():
+        if config['max_zoom'] is None or zoom <= config['max_zoom']:
+            return tier
+    return 'full'
+
+
+# ---- 단순화 --------------------------------------------------------------------
+
+def douglas_peucker(points, tolerance):
+    """열린 선(첫 점과 끝 점 고정)을 단순화해 남길 점의 불리언 마스크를 반환한다."""
+    keep = np.zeros(len(points), dtype=bool)
+    keep[0] = keep[-1] = True
+    if tolerance <= 0:
+        keep[:] = True
+        return keep
+    stack = [(0, len(points) - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        segment = points[end] - points[start]
+        offsets = points[start + 1:end] - points[start]
+        length = np.hypot(*segment)
+        if length == 0:
+            distances = np.hypot(offsets[:, 0], offsets[:, 1])
+        else:
+            distances = np.abs(segment[0] * offsets[:, 1] - segment[1] * offsets[:, 0]) / length
+        index = int(np.argmax(distances))
+        if distances[index] > tolerance:
+            middle = start + 1 + index
+            keep[middle] = True
+            stack.append((start, middle))
+            stack.append((middle, end))
+    return keep
+
+
+def _edge(a, b):
+    return (a, b) if a <= b else (b, a)
+
+
+def _junctions(rings):
+    """경계선이 갈라지는 점: 앞뒤 변을 공유하는 고리의 수가 달라지는 곳."""
+    edges = Counter()
+    for ring in rings:
+        for a, b in zip(ring, ring[1:]):
+            edges[_edge(a, b)] += 1
+    junctions = set()
+    for ring in rings:
+        closed = ring[:-1]
+        for i, point in enumerate(closed):
+            before = edges[_edge(closed[i - 1], point)]
+            after = edges[_edge(point, closed[(i + 1) % len(closed)])]
+            if before != after:
+                junctions.add(point)
+    return junctions
+
+
+def _simplify_arc(arc, tolerance, done):
+    # 같은 경계선은 방향과 무관하게 한 번만 계산해 양쪽 구역이 같은 결과를 쓰도록 함
+    forward = arc[0] < arc[-1] or (arc[0] == arc[-1] and arc[1] <= arc[-2])
+    key = tuple(arc) if forward else tuple(reversed(arc))
+    if key not in done:
+        points = np.array(key, dtype=float) * QUANTUM
+        mask = douglas_peucker(points, tolerance)
+        done[key] = [point for point, kept in zip(key, mask) if kept]
+    result = done[key]
+    return result if forward else result[::-1]
+
+
+def simplify_rings(rings, tolerance):
+    """양자화된 닫힌 고리 목록을 단순화한다. 고리는 최소 4점(삼각형)을 유지한다."""
+    junctions = _junctions(rings)
+    done = {}
+    simplified = []
+    for ring in rings:
+        closed = ring[:-1]
+        cuts = [i for i, point in enumerate(closed) if point in junctions]
+        if not cuts:
+            # 다른 구역과 닿지 않는 고리: 첫 점과 가장 먼 점에서 나눔
+            far = int(np.argmax([abs(x - closed[0][0]) + abs(y - closed[0][1]) for x, y in closed]))
+            cuts = [0, far] if far else [0]
+        # 첫 분할점에서 시작하도록 돌려 놓고 분할점마다 경계선으로 나눔
+        start = cuts[0]
+        rotated = closed[start:] + closed[:start] + [closed[start]]
+        bounds = [i - start for i in cuts] + [len(closed)]
+        points = []
+        for a, b in zip(bounds, bounds[1:]):
+            points.extend(_simplify_arc(rotated[a:b + 1], tolerance, done)[:-1])
+        if len(points) < 3:
+            points = closed
+        simplified.append(points + [points[0]])
+    return simplified
+
+
+# ---- 변환 -----------------------------------------------------------------------
+
+def _polygons(geometry):
+    if geometry['type'] == 'Polygon':
+        return [geometry['coordinates']]
+    if geometry['type'] == 'MultiPolygon':
+        return geometry['coordinates']
+    raise ValueError(f"지원하지 않는 도형: {geometry['type']}")
+
+
+def quantize(geojson):
+    """GeoJSON -> (도형 종류, 속성, 구역별 다각형별 정수 좌표 고리)."""
+    features = []
+    for feature in geojson['features']:
+        polygons = [
+            [[(round(x / QUANTUM), round(y / QUANTUM)) for x, y in ring] for ring in polygon]
+            for polygon in _polygons(feature['geometry'])
+        ]
+        features.append((feature['geometry']['type'], feature.get('properties', {}), polygons))
+    return features
+
+
+def build_tiers(geojson):
+    """단계별 단순화 결과를 압축 배열(dict of ndarray)로 만든다."""
+    features = quantize(geojson)
+    rings = [ring for _, _, polygons in features for polygon in polygons for ring in polygon]
+    arrays = {
+        'types': np.array([kind == 'MultiPolygon' for kind, _, _ in features]),
+        'properties': np.array(json.dumps([props for _, props, _ in features], ensure_ascii=False)),
+        'polygon_offsets': np.cumsum([0] + [len(polygons) for _, _, polygons in features]),
+        'ring_offsets': np.cumsum([0] + [len(polygon) for _, _, polygons in features for polygon in polygons]),
+    }
+    for tier, config in TIERS.items():
+        simplified = simplify_rings(rings, config['tolerance'])
+        coords = np.array([point for ring in simplified for point in ring], dtype=np.int64)
+        # 첫 점 기준 차이를 int32로 저장 (서울 범위는 int32로 충분)
+        arrays[f'{tier}_origin'] = coords.min(axis=0)
+        arrays[f'{tier}_coords'] = (coords - coords.min(axis=0)).astype(np.int32)
+        arrays[f'{tier}_point_offsets'] = np.cumsum([0] + [len(ring) for ring in simplified])
+    return arrays
+
+
+def to_geojson(arrays, tier):
+    """압축 배열의 한 단계를 GeoJSON dict로 푼다 (소수점 자리수는 단계 설정)."""
+    digits = TIERS[tier]['digits']
+    coords = np.round((arrays[f'{tier}_coords'] + arrays[f'{tier}_origin']) * QUANTUM, digits).tolist()
+    points = arrays[f'{tier}_point_offsets']
+    rings = arrays['ring_offsets']
+    polygons = arrays['polygon_offsets']
+    features = []
+    for index, props in enumerate(json.loads(str(arrays['properties']))):
+        shapes = []
+        for p in range(polygons[index], polygons[index + 1]):
+            shapes.append([coords[points[r]:points[r + 1]] for r in range(rings[p], rings[p + 1])])
+        multi = bool(arrays['types'][index])
+        features.append({
+            'type': 'Feature',
+            'properties': props,
+            'geometry': {'type': 'MultiPolygon' if multi else 'Polygon', 'coordinates': shapes if multi else shapes[0]},
+        })
+    return {'type': 'FeatureCollection', 'features': features}
+
+
+# ---- 저장 -----------------------------------------------------------------------
+
+def source_version(path):
+    stat = os.stat(path)
+    return f'{GEOMETRY_FORMAT}:{stat.st_mtime_ns}:{stat.st_size}'
+
+
+def artifact_path(path):
+    return SNAPSHOT_DIR / (Path(path).stem + '.geo.npz')
+
+
+def write_artifact(path):
+    with open(path, encoding='utf-8') as f:
+        arrays = build_tiers(json.load(f))
+    SNAPSHOT_DIR.mkdir(exist_ok=True)
+    target = artifact_path(path)
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, source_version=np.array(source_version(path)), **arrays)
+    tmp_path = target.with_suffix('.tmp')
+    tmp_path.write_bytes(buffer.getvalue())
+    os.replace(tmp_path, target)
+    return target
+
+
+def read_artifact(path):
+    """저장된 단계별 경계가 최신이면 배열 dict를, 아니면 None을 반환한다."""
+    target = artifact_path(path)
+    if not target.exists():
+        return None
+    with np.load(target) as data:
+        if str(data['source_version']) != source_version(path):
+            return None
+        return {name: data[name] for name in data.files}
+
+
+def is_fresh(path):
+    return read_artifact(path) is not None
+
+
+def geojson_files():
+    return sorted(path for path in BASE_DIR.glob('*.json') if '_geo' in path.stem)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='GeoJSON -> 확대 수준별 단순화 경계')
+    parser.add_argument('names', nargs='*', help='변환할 GeoJSON 파일 (기본: 전체)')
+    parser.add_argument('--force', action='store_true', help='최신 파일도 다시 생성')
+    parser.add_argument('--check', action='store_true', help='오래된 파일만 출력')
+    args = parser.parse_args()
+
+    paths = [BASE_DIR / name for name in args.names] or geojson_files()
+    stale = [path for path in paths if args.force or not is_fresh(path)]
+    if args.check:
+        for path in stale:
+            print(f'stale: {path.name}')
+        return 1 if stale else 0
+    for path in stale:
+        target = write_artifact(path)
+        arrays = read_artifact(path)
+        points = ', '.join(f"{tier} {len(arrays[f'{tier}_coords'])}" for tier in TIERS)
+        print(f'{path.name} -> {target.relative_to(BASE_DIR)} ({target.stat().st_size:,} bytes; points {points})')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,210 @@
+"""새 분기 폐업률 행을 CSV 전체를 다시 읽지 않고 추가한다.
+
+    python ingest.py 2024-03.csv              # 새 분기 행 추가 (기본 폐업률.csv)
+    python ingest.py --watch incoming         # 폴더에 들어오는 CSV를 차례로 추가 (done/, failed/로 옮김)
+    python ingest.py --check                  # 쌓인 세그먼트 목록
+    python ingest.py --compact                # 세그먼트를 원본 CSV에 합치고 스냅샷 다시 생성
+
+- 들어온 행은 열 이름, 숫자 열, 년_분기 형식(YYYY-0Q)과 년/분기 일치, 알려진 자치구,
+  자치구+업종 중복, 이미 있는 분기인지 검사한 뒤 분기마다
+  snapshots/<이름>.segments/<년_분기>.arrow 세그먼트로 저장한다 (원본 CSV는 그대로).
+- 폐업률.csv의 자치구/분기 합계로 만든 지도용 파일(DISTRICT_TOTALS)에도 같은 분기의 합계를 추가한다.
+- 실행 중인 앱은 다음 재실행에서 세그먼트를 발견하고, 큐브(rollup), 폐업 점포 수 합계(lookup),
+  분기별 지도(choropleth)는 직전 결과에 새 분기 행만 더한다 (data_loader.incremental).
+"""
+import argparse
+import os
+import re
+import time
+from pathlib import Path
+
+import pandas as pd
+
+import snapshots
+from cleaning import MISSING
+from data_loader import data_path, load_table, segment_rows
+
+CLOSURE = '폐업률.csv'
+
+QUARTER = re.compile(r'^(\d{4})-0([1-4])$')
+
+# 한 분기 안에서 겹치면 안 되는 열
+KEYS = ['자치구_코드_명', '서비스_업종_코드_명']
+
+# 폐업률.csv를 자치구/분기로 합계한 파일 -> 합계할 열 (app3 분기별 지도 데이터)
+DISTRICT_TOTALS = {
+    '폐업_률.csv': '폐업_률',
+    '폐업_점포_수.csv': '폐업_점포_수',
+    '구별_연도별_프랜차이즈.csv': '프랜차이즈_점포_수',
+}
+
+
+def validate(rows, table):
+    """새 행을 기존 표(load_table 결과)와 맞춰 검사하고, 열 순서와 형식을 맞춘 표를 반환한다."""
+    missing = [column for column in table.columns if column not in rows.columns]
+    unknown = [column for column in rows.columns if column not in table.columns]
+    if missing or unknown:
+        raise ValueError(f'열이 맞지 않음: 빠진 열 {missing}, 모르는 열 {unknown}')
+    if rows.empty:
+        raise ValueError('행이 없음')
+    rows = rows[list(table.columns)].copy()
+
+    quarter = rows['년_분기'].astype(str).str.strip()
+    parts = quarter.str.extract(QUARTER)
+    bad = quarter[parts[0].isna()].unique().tolist()
+    if bad:
+        raise ValueError(f'년_분기 형식이 아님 (YYYY-0Q): {bad[:5]}')
+    rows['년_분기'] = quarter
+
+    for column in table.columns:
+        dtype = table[column].dtype
+        if column == '년_분기' or not pd.api.types.is_numeric_dtype(dtype):
+            continue
+        values = pd.to_numeric(rows[column], errors='coerce')
+        invalid = values.isna() & rows[column].notna()
+        if invalid.any():
+            raise ValueError(f'{column}: 숫자가 아닌 값 {rows.loc[invalid, column].unique().tolist()[:5]}')
+        if values.isna().any() and not pd.api.types.is_float_dtype(dtype):
+            raise ValueError(f'{column}: 빈 값 {int(values.isna().sum())}개')
+        rows[column] = values.astype(dtype)
+    for column, part in (('년', 0), ('분기', 1)):
+        if column in rows.columns and (rows[column] != parts[part].astype(int)).any():
+            raise ValueError(f'{column} 열이 년_분기와 다름')
+
+    districts = set(table['자치구_코드_명'].astype(str))
+    unknown_districts = sorted(set(rows['자치구_코드_명'].astype(str)) - districts)
+    if unknown_districts:
+        raise ValueError(f'모르는 자치구: {unknown_districts}')
+    keys = ['년_분기'] + [column for column in KEYS if column in rows.columns]
+    duplicated = rows.duplicated(keys)
+    if duplicated.any():
+        raise ValueError(f'{"+".join(keys)} 중복 {int(duplicated.sum())}행')
+    existing = sorted(set(quarter) & set(table['년_분기'].astype(str)))
+    if existing:
+        raise ValueError(f'이미 있는 분기: {existing}')
+    return rows
+
+
+def district_totals(rows, table, column):
+    """새 분기 행의 자치구/분기 합계를 지도용 파일(table)의 열 순서와 형식으로."""
+    totals = rows.groupby(['자치구_코드_명', '년_분기'], observed=True)[column].sum().reset_index()
+    totals['자치구_코드_명'] = totals['자치구_코드_명'].astype(str)
+    return validate(totals, table)
+
+
+def ingest(path, name=CLOSURE):
+    """path의 새 분기 행을 검사해 분기별 세그먼트로 추가하고, 추가한 분기 목록을 반환한다."""
+    rows = validate(snapshots.read_csv(path), load_table(name))
+    # 하나라도 검사에 걸리면 아무것도 쓰지 않도록 합계도 먼저 모두 만들어 둠
+    totals = {}
+    if name == CLOSURE:
+        totals = {target: district_totals(rows, load_table(target), column)
+                  for target, column in DISTRICT_TOTALS.items()}
+    quarters = []
+    for quarter, frame in rows.groupby('년_분기', sort=True):
+        for target, total in totals.items():
+            snapshots.write_segment(data_path(target), quarter,
+                                    total[total['년_분기'] == quarter].reset_index(drop=True))
+        # 원본 세그먼트를 마지막에 써서, 이것이 보이면 지도 데이터도 이미 있음
+        snapshots.write_segment(data_path(name), quarter, frame.reset_index(drop=True))
+        quarters.append(quarter)
+    return quarters
+
+
+def watch(folder, name=CLOSURE, interval=5.0):
+    """folder에 들어오는 CSV를 차례로 추가한다. 성공하면 done/, 실패하면 failed/로 옮긴다."""
+    folder = Path(folder)
+    for sub in ('done', 'failed'):
+        (folder / sub).mkdir(parents=True, exist_ok=True)
+    print(f'{folder}의 새 CSV를 {interval:g}초마다 확인 (Ctrl+C로 종료)', flush=True)
+    while True:
+        for path in sorted(folder.glob('*.csv')):
+            # 아직 복사 중일 수 있는 파일은 다음 차례에
+            if time.time() - path.stat().st_mtime < interval:
+                continue
+            try:
+                quarters = ingest(path, name)
+            except ValueError as error:
+                print(f'{path.name}: 실패 - {error}', flush=True)
+                os.replace(path, folder / 'failed' / path.name)
+                continue
+            print(f"{path.name}: {', '.join(quarters)} 추가", flush=True)
+            os.replace(path, folder / 'done' / path.name)
+        time.sleep(interval)
+
+
+def segment_status(name):
+    """(분기, 행 수 또는 None) 목록. None은 원본 CSV가 바뀌어 무시되는 세그먼트."""
+    path = data_path(name)
+    status = []
+    for label, *_ in snapshots.segment_versions(path):
+        rows = snapshots.read_segment(path, label)
+        status.append((label, None if rows is None else len(rows)))
+    return status
+
+
+def compact(name):
+    """세그먼트를 원본 CSV 끝에 덧붙이고 지운 뒤, 스냅샷이 있으면 다시 만든다."""
+    path = data_path(name)
+    status = segment_status(name)
+    if not status:
+        return 0
+    if any(count is None for _, count in status):
+        raise ValueError(f'{name}: 원본 CSV가 바뀌어 무시되는 세그먼트가 있음 (--check로 확인)')
+    rows = segment_rows(name, [label for label, _ in status])
+    with open(path, 'rb') as f:
+        first_line = f.readline()
+        f.seek(-1, os.SEEK_END)
+        ends_with_newline = f.read(1) == b'\n'
+    newline = '\r\n' if first_line.endswith(b'\r\n') else '\n'
+    text = rows.to_csv(header=False, index=False, na_rep=MISSING, lineterminator=newline)
+    with open(path, 'a', encoding='utf-8', newline='') as f:
+        f.write(('' if ends_with_newline else newline) + text)
+    # CSV가 바뀌었으므로 지우기 전에 멈춰도 남은 세그먼트는 무시됨 (두 번 더해지지 않음)
+    for label, _ in status:
+        (snapshots.segment_dir(path) / f'{label}.arrow').unlink()
+    snapshots.segment_dir(path).rmdir()
+    if snapshots.snapshot_path(path).exists():
+        snapshots.write_snapshot(path)
+    return len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='새 분기 행을 세그먼트로 추가')
+    parser.add_argument('files', nargs='*', help='추가할 CSV 파일')
+    parser.add_argument('--dataset', default=CLOSURE, help=f'추가할 데이터셋 (기본: {CLOSURE})')
+    parser.add_argument('--watch', metavar='DIR', help='이 폴더에 들어오는 CSV를 계속 추가')
+    parser.add_argument('--interval', type=float, default=5.0, help='--watch 확인 간격(초)')
+    parser.add_argument('--check', action='store_true', help='쌓인 세그먼트 목록만 출력')
+    parser.add_argument('--compact', action='store_true', help='세그먼트를 원본 CSV에 합침')
+    args = parser.parse_args()
+
+    datasets = [args.dataset] + (list(DISTRICT_TOTALS) if args.dataset == CLOSURE else [])
+    if args.check:
+        stale = False
+        for name in datasets:
+            for label, count in segment_status(name):
+                stale = stale or count is None
+                print(f"{name}: {label} {'무시됨 (원본 CSV가 바뀜)' if count is None else f'{count}행'}")
+        return 1 if stale else 0
+    if args.compact:
+        for name in datasets:
+            print(f'{name}: {compact(name)}행 합침')
+        return 0
+    if args.watch:
+        try:
+            watch(args.watch, args.dataset, args.interval)
+        except KeyboardInterrupt:
+            return 0
+    for file in args.files:
+        try:
+            quarters = ingest(file, args.dataset)
+        except ValueError as error:
+            print(f'{file}: {error}')
+            return 1
+        print(f"{file}: {', '.join(quarters)} 추가")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
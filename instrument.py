@@ -0,0 +1,239 @@
+"""재실행(rerun)마다 데이터 읽기, 변환, 차트 출력 단계의 시간을 기록한다.
+
+    with instrument.span('대출금리 보간', 'transform'):
+        ...
+
+- 모든 구간의 시간은 항상 기록하고 프로세스 전체 누적값을 유지한다 (perf_counter 두 번이라 부담 없음).
+- 디버그 모드(DASHBOARD_DEBUG=1)에서는 tracemalloc으로 구간별 최대 메모리 증가량과
+  출력 크기까지 재고, 사이드바에 이번 실행의 구간표를 보여 준다. tracemalloc은 프로세스 전체를
+  추적하므로 디버그 실행이 있는 동안만 켜 두고, 최대 메모리도 그 구간 동안 프로세스 전체
+  (동시에 실행 중인 다른 세션 포함)의 값이다. 방문자가 켤 수 없도록 URL 인자로는 켜지 않는다.
+- DASHBOARD_METRICS_FILE을 지정하면 누적값을 Prometheus 텍스트 형식으로 그 파일에 기록한다
+  (node_exporter textfile collector 등 로컬 수집기가 읽을 수 있음).
+- 각 구간은 `instrument` 로거에 JSON 한 줄로 남는다 (DEBUG 레벨).
+"""
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+METRICS_FILE = os.environ.get('DASHBOARD_METRICS_FILE')
+
+_local = threading.local()
+_lock = threading.Lock()
+# (page, kind, name) -> 누적값
+_totals = {}
+# tracemalloc을 켜 둔 디버그 실행 수 (마지막 실행이 끝나면 끔)
+_tracing_runs = 0
+
+
+def _runs():
+    # 세션마다 스크립트가 별도 스레드에서 실행되므로 스레드별로 이번 실행의 기록을 모음
+    if not hasattr(_local, 'spans'):
+        _local.spans = []
+        _local.stack = []
+        _local.page = None
+    return _local
+
+
+def debug_enabled():
+    return os.environ.get('DASHBOARD_DEBUG') == '1'
+
+
+def _start_tracing(run):
+    global _tracing_runs
+    with _lock:
+        _tracing_runs += 1
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+    run.tracing = True
+
+
+def _stop_tracing(run):
+    global _tracing_runs
+    if not getattr(run, 'tracing', False):
+        return
+    run.tracing = False
+    with _lock:
+        _tracing_runs -= 1
+        if _tracing_runs == 0 and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+
+def begin(page):
+    """페이지 실행 시작: 이전 실행 기록을 비우고, 디버그 모드면 메모리 추적을 켠다."""
+    run = _runs()
+    # 이전 실행이 panel()까지 가지 못하고 끝났으면 그 실행이 켠 추적을 먼저 정리
+    _stop_tracing(run)
+    run.spans = []
+    run.stack = []
+    run.page = Path(page).stem
+    run.debug = debug_enabled()
+    if run.debug:
+        _start_tracing(run)
+
+
+class Span:
+    def __init__(self, name, kind):
+        self.name = name
+        self.kind = kind
+        self.seconds = None
+        self.peak_bytes = None
+        self.output_bytes = None
+        self._start_memory = None
+        self._peak = 0
+
+    def as_dict(self):
+        return {
+            'name': self.name, 'kind': self.kind, 'seconds': self.seconds,
+            'peak_bytes': self.peak_bytes, 'output_bytes': self.output_bytes,
+        }
+
+
+@contextmanager
+def span(name, kind):
+    """구간 하나를 기록한다. 출력 크기를 알면 `span.output_bytes`에 넣는다."""
+    run = _runs()
+    current = Span(name, kind)
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        size, peak = tracemalloc.get_traced_memory()
+        # 바깥 구간의 최대값을 넘겨 준 뒤 이 구간 기준으로 다시 잼
+        for outer in run.stack:
+            outer._peak = max(outer._peak, peak)
+        tracemalloc.reset_peak()
+        current._start_memory = size
+    run.stack.append(current)
+    start = time.perf_counter()
+    try:
+        yield current
+    finally:
+        current.seconds = time.perf_counter() - start
+        run.stack.pop()
+        if tracing and tracemalloc.is_tracing():
+            _, peak = tracemalloc.get_traced_memory()
+            current._peak = max(current._peak, peak)
+            current.peak_bytes = max(current._peak - current._start_memory, 0)
+            for outer in run.stack:
+                outer._peak = max(outer._peak, current._peak)
+        _record(run, current)
+
+
+def _record(run, current):
+    if run.page is not None:
+        run.spans.append(current)
+    key = (run.page or '', current.kind, current.name)
+    with _lock:
+        total = _totals.setdefault(key, {'count': 0, 'seconds': 0.0, 'output_bytes': 0, 'peak_bytes': 0})
+        total['count'] += 1
+        total['seconds'] += current.seconds
+        total['output_bytes'] += current.output_bytes or 0
+        total['peak_bytes'] = max(total['peak_bytes'], current.peak_bytes or 0)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(json.dumps({'page': run.page, **current.as_dict()}, ensure_ascii=False))
+
+
+def rss_mb():
+    """현재 RSS(MB). /proc이 없는 환경에서는 None."""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+    except OSError:
+        return None
+    return pages * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+
+
+def peak_rss_mb():
+    """프로세스 최대 RSS(MB). resource 모듈이 없는 환경(Windows)에서는 None."""
+    try:
+        # Linux: ru_maxrss는 fork/exec한 부모의 최대값을 물려받으므로 이 프로세스만의 VmHWM을 우선 사용
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+def measure_output():
+    """출력 크기를 따로 계산해야 하는 경우(plotly 직렬화 등) 디버그 모드에서만 잰다."""
+    return getattr(_runs(), 'debug', False)
+
+
+def plotly_chart(fig, name, **kwargs):
+    """st.plotly_chart 대신 사용: 전송 시간을 기록하고 디버그 모드에서는 JSON 크기도 잰다."""
+    with span(name, 'render') as current:
+        if measure_output():
+            current.output_bytes = len(fig.to_json())
+        return st.plotly_chart(fig, **kwargs)
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def prometheus_text():
+    """누적값을 Prometheus 텍스트 노출 형식으로 만든다."""
+    metrics = [
+        ('dashboard_span_count_total', 'counter', '구간 실행 횟수', 'count'),
+        ('dashboard_span_seconds_total', 'counter', '구간 누적 시간(초)', 'seconds'),
+        ('dashboard_span_output_bytes_total', 'counter', '누적 출력 크기(바이트)', 'output_bytes'),
+        ('dashboard_span_peak_bytes', 'gauge', '구간 중 프로세스 최대 메모리 증가량(바이트, 디버그 모드에서만)', 'peak_bytes'),
+    ]
+    with _lock:
+        totals = sorted(_totals.items())
+    lines = []
+    for metric, kind, help_text, field in metrics:
+        lines.append(f'# HELP {metric} {help_text}')
+        lines.append(f'# TYPE {metric} {kind}')
+        for (page, span_kind, name), total in totals:
+            labels = f'page="{_label(page)}",kind="{_label(span_kind)}",name="{_label(name)}"'
+            lines.append(f'{metric}{{{labels}}} {total[field]}')
+    return '\n'.join(lines) + '\n'
+
+
+def export(path=METRICS_FILE):
+    if not path:
+        return
+    # 수집기가 쓰다 만 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(prometheus_text())
+    os.replace(tmp_path, path)
+
+
+def panel():
+    """페이지 끝에서 호출: 메트릭 파일을 갱신하고, 디버그 모드면 메모리 추적을 끄고 사이드바에 이번 실행의 구간표를 표시."""
+    run = _runs()
+    _stop_tracing(run)
+    export()
+    if not getattr(run, 'debug', False):
+        return
+    rows = [span.as_dict() for span in run.spans]
+    with st.sidebar.expander('디버그: 실행 시간', expanded=True):
+        st.caption(f'{len(rows)}개 구간 (안쪽 구간은 바깥 구간 시간에도 포함됨, 최대 메모리는 프로세스 전체 기준)')
+        st.dataframe(
+            rows,
+            hide_index=True,
+            column_config={
+                'seconds': st.column_config.NumberColumn('초', format='%.4f'),
+                'peak_bytes': st.column_config.NumberColumn('최대 메모리 증가', format='%d'),
+                'output_bytes': st.column_config.NumberColumn('출력 크기', format='%d'),
+            },
+        )
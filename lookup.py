@@ -0,0 +1,23 @@
+import pandas as pd
+import streamlit as st
+
+from data_loader import incremental, load_table, table_version
+
+# 자치구별 년_분기 평균 폐업률은 rollup 큐브의 (자치구, 년_분기) 집계를 씀 (rollup.district_rate)
+CLOSED_STORES = '폐업_점포_수.csv'
+
+
+def _closed_stores(df):
+    return df.groupby(['자치구_코드_명', '년_분기'], observed=True, sort=True)['폐업_점포_수'].sum()
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _closed_stores_by_district(version):
+    return incremental('closed_stores', CLOSED_STORES, version,
+                       lambda: _closed_stores(load_table(CLOSED_STORES)),
+                       lambda closed, rows: pd.concat([closed, _closed_stores(rows)]).sort_index())
+
+
+def district_closed_stores(district):
+    """자치구의 년_분기별 폐업 점포 수 합계 (폐업_점포_수.csv)."""
+    return _closed_stores_by_district(table_version(CLOSED_STORES)).loc[district]
@@ -0,0 +1,64 @@
+import folium
+from branca.element import MacroElement
+from jinja2 import Template
+
+# 기존 DivIcon 라벨과 같은 모양
+LABEL_STYLE = 'font-size: 12px; color: black; text-align: center; white-space: nowrap;'
+
+
+class PointLayer(MacroElement):
+    """모든 지점을 하나의 GeoJSON 레이어로 그린다.
+
+    행마다 CircleMarker/Marker 객체를 만들지 않고, 좌표와 반지름, 라벨을
+    GeoJSON 속성으로 한 번에 넘긴 뒤 브라우저에서 원과 라벨을 만든다.
+    `circles`는 원 종류별 Leaflet 옵션이며 `radius`에는 반지름 속성 이름을 쓴다.
+    """
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+            var {{ this.get_name() }}_circles = {{ this.circles|tojson }};
+            var {{ this.get_name() }} = L.geoJSON({{ this.data|tojson }}, {
+                pointToLayer: function (feature, latlng) {
+                    var layers = {{ this.get_name() }}_circles.map(function (circle) {
+                        var options = Object.assign({}, circle, {radius: feature.properties[circle.radius]});
+                        return L.circleMarker(latlng, options);
+                    });
+                    layers.push(L.marker(latlng, {icon: L.divIcon({
+                        className: '',
+                        html: '<div style="{{ this.label_style }}"><b>' + feature.properties.label + '</b></div>'
+                    })}));
+                    return L.featureGroup(layers);
+                }
+            }).addTo({{ this._parent.get_name() }});
+        {% endmacro %}
+    """)
+
+    def __init__(self, data, circles, label_style=LABEL_STYLE):
+        super().__init__()
+        self._name = 'PointLayer'
+        self.data = data
+        self.circles = circles
+        self.label_style = label_style
+
+
+def points(lat, lon, **properties):
+    """열(Series/배열) 단위 입력을 GeoJSON FeatureCollection으로 변환한다."""
+    names = list(properties)
+    columns = [list(map(float, lon)), list(map(float, lat))]
+    columns += [values.tolist() if hasattr(values, 'tolist') else list(values) for values in properties.values()]
+    features = [
+        {
+            'type': 'Feature',
+            'geometry': {'type': 'Point', 'coordinates': [x, y]},
+            'properties': dict(zip(names, values)),
+        }
+        for x, y, *values in zip(*columns)
+    ]
+    return {'type': 'FeatureCollection', 'features': features}
+
+
+def render(layer, location, zoom_start):
+    # 매번 새 지도를 만들어 이전 선택의 마커가 쌓이지 않도록 함
+    my_map = folium.Map(location=location, zoom_start=zoom_start)
+    layer.add_to(my_map)
+    return my_map._repr_html_()
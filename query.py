@@ -0,0 +1,374 @@
+"""페이지와 차트가 원본 표 대신 작은 집계 결과를 이름 있는 질의로 받아 가는 데이터 계층.
+
+    query.fetch('closure_rate_by_quarter', district='강남구')   # 페이지/차트에서 (DataFrame)
+    python query.py --port 8765                                # 데이터 계층만 별도 프로세스로
+    DASHBOARD_QUERY_URL=http://127.0.0.1:8765 streamlit run streamlit_app.py
+
+- 질의마다 의존하는 데이터 파일과 인자별 선택지(options)를 등록한다. 선택지에 없는 값은 QueryError.
+- 결과는 (질의, 인자, 데이터 버전)으로 캐시하고, 같은 키로 만든 ETag를 붙인다.
+  ETag는 파일 버전만으로 계산하므로 질의를 실행하지 않고도 304를 돌려줄 수 있다.
+- DASHBOARD_QUERY_URL이 있으면 fetch는 HTTP로 묻는다. 받은 결과와 ETag를 기억했다가
+  If-None-Match로 다시 물어 304이면 기억한 결과를 쓴다. 이때 Streamlit 프로세스는 질의로 받는
+  차트(선/막대 차트, 점 지도)와 위젯 선택지를 위해 원본 표를 읽지 않으므로, 여러 UI 프로세스가
+  따뜻한 데이터 프로세스 하나를 함께 쓸 수 있다.
+- 결과는 Arrow IPC 스트림으로 주고받아 열 형식과 인덱스가 그대로 유지된다.
+- 예외: app3의 plotly 지도(choropleth 모듈의 분기별/전체 기간 지도와 분기 선택지, 자치구 인구밀도 지도)는
+  아직 각 프로세스에서 데이터와 GeoJSON을 읽는다. 또 차트 캐시 키(데이터 버전)를 위해 데이터 파일의
+  수정시각을 확인하므로 UI 프로세스도 같은 데이터 파일에 접근할 수 있어야 한다.
+"""
+import argparse
+import hashlib
+import json
+import os
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import pyarrow as pa
+import streamlit as st
+
+import density
+import instrument
+import lookup
+import rollup
+from charts import data
+from data_loader import freeze, table_version
+
+URL = os.environ.get('DASHBOARD_QUERY_URL')
+TIMEOUT = float(os.environ.get('DASHBOARD_QUERY_TIMEOUT') or 10)
+
+# 응답 형식이 바뀌면 올려서 기존 ETag를 무효화
+QUERY_FORMAT = 1
+CONTENT_TYPE = 'application/vnd.apache.arrow.stream'
+
+# 질의 이름 -> 함수
+QUERIES = {}
+
+
+class QueryError(ValueError):
+    """모르는 질의, 빠지거나 선택지에 없는 인자."""
+
+
+def query(*data, **params):
+    """질의 등록. data는 결과가 의존하는 데이터 파일, params는 인자 이름 -> 선택지 목록을 돌려주는 함수.
+
+    질의 함수는 인자만 받아 DataFrame을 반환하고, 같은 인자와 같은 데이터 버전이면 같은 결과여야 한다.
+    선택지도 데이터 버전마다 한 번만 만들므로 data 파일로만 정해져야 한다.
+    """
+    def register(func):
+        func.query_id = func.__name__
+        func.data = data
+        func.params = params
+        QUERIES[func.query_id] = func
+        return func
+    return register
+
+
+# ---- 질의 ---------------------------------------------------------------------
+
+@query(data.RENT)
+def regions():
+    return pd.DataFrame({'지역': data.regions()})
+
+
+@query(data.RENT)
+def rent_quarters():
+    return pd.DataFrame({'분기': data.rent_quarters()})
+
+
+@query(data.RENT, region=data.regions)
+def rent_by_quarter(region):
+    """지역의 분기별 임대료 (분기, 값)."""
+    df = data.rents()
+    values = df[df['지역'] == region].set_index('지역').T.reset_index()
+    values.columns = ['분기', '값']
+    return values
+
+
+@query(data.RENT)
+def rent_extremes():
+    return data.rent_extremes()
+
+
+@query(data.RENT, quarter=data.rent_quarters)
+def rent_by_region(quarter):
+    """분기의 시도별 임대료와 지도 좌표 (지역, lat, lon, 값)."""
+    df = data.rent_locations()
+    return pd.DataFrame({'지역': df['지역'].astype(str), 'lat': df['lat'], 'lon': df['lon'], '값': df[quarter]})
+
+
+@query(data.CPI)
+def prices():
+    """소비자물가지수 (날짜 'YYYY-MM')."""
+    return data.prices()
+
+
+@query(data.LOAN)
+def loan_rates():
+    """대출금리 (0은 선형 보간, 2024-09까지)."""
+    df = data.loan_rates()
+    return pd.DataFrame({'날짜': df['날짜'], '대출금리': df['대출금리'].astype(float)})
+
+
+@query(data.GDP, year=lambda: data.GDP_YEARS)
+def gdp_by_district(year):
+    """년도의 지역별 지역내총생산(gdp)과 1인당 지역내총생산(gdp_per_capita)."""
+    return data.gdp(year)
+
+
+@query(data.EMPLOYMENT, year=lambda: data.EMPLOYMENT_YEARS)
+def employment_by_district(year):
+    """연도의 자치구별 사업체수, 종사자수와 지도 좌표."""
+    df = data.employment_locations()
+    return pd.DataFrame({
+        '지역': df['지역'].astype(str), 'lat': df['lat'], 'lon': df['lon'],
+        '사업체수': df[f'{year} 사업체수'], '종사자수': df[f'{year} 종사자수'],
+    })
+
+
+@query(data.CLOSURE)
+def districts():
+    return pd.DataFrame({'자치구_코드_명': data.districts()})
+
+
+@query(data.CLOSURE, district=data.districts)
+def closure_rate_by_quarter(district):
+    """자치구의 년_분기별 평균 폐업률."""
+    return rollup.district_rate(district).to_frame()
+
+
+@query(data.CLOSED_STORES, district=data.districts)
+def closed_stores_by_quarter(district):
+    """자치구의 년_분기별 폐업 점포 수 합계."""
+    return lookup.district_closed_stores(district).to_frame()
+
+
+@query(data.CLOSURE, by=lambda: ['년', '분기', '년_분기'])
+def closure_mean(by):
+    """집계 단위별 평균 폐업률과 95% 신뢰구간 (rollup 큐브)."""
+    return rollup.closure_cube().rollup(by)
+
+
+@query(density.DENSITY)
+def density_years():
+    return pd.DataFrame({'연도': density.years()})
+
+
+@query(density.DENSITY, district=lambda: density.density_table().districts.index.tolist(), year=density.years)
+def dong_density(district, year):
+    """자치구 안 행정동별 인구밀도 (높은 순)."""
+    return density.dong_frame(district, year)
+
+
+# ---- 실행과 캐시 ------------------------------------------------------------------
+
+@st.cache_resource(max_entries=256, show_spinner=False)
+def _choices(name, key, data_version):
+    # 선택지 문자열 -> 값 (캐시된 결과를 꺼낼 때마다 전체 표를 다시 훑지 않도록)
+    choices = {}
+    for choice in QUERIES[name].params[key]():
+        choices.setdefault(str(choice), choice)
+    return choices
+
+
+def resolve(name, params, data_version=None):
+    """질의 이름과 인자를 검사해 정렬된 (인자, 값) 튜플로. 문자열로 온 값은 선택지의 같은 값으로 바꾼다."""
+    func = QUERIES.get(name)
+    if func is None:
+        raise QueryError(f'모르는 질의: {name}')
+    missing = sorted(set(func.params) - set(params))
+    unknown = sorted(set(params) - set(func.params))
+    if missing or unknown:
+        raise QueryError(f'{name}: 빠진 인자 {missing}, 모르는 인자 {unknown}')
+    if data_version is None:
+        data_version = version(name)
+    resolved = {}
+    for key, value in params.items():
+        choices = _choices(name, key, data_version)
+        if str(value) not in choices:
+            raise QueryError(f'{name}: {key}={value!r}은(는) 선택지에 없음')
+        resolved[key] = choices[str(value)]
+    return tuple(sorted(resolved.items()))
+
+
+def version(name):
+    return tuple(table_version(file) for file in QUERIES[name].data)
+
+
+def etag(name, params, data_version=None):
+    key = (QUERY_FORMAT, name, params, version(name) if data_version is None else data_version)
+    return '"' + hashlib.sha1(repr(key).encode()).hexdigest()[:20] + '"'
+
+
+def encode(frame):
+    sink = pa.BufferOutputStream()
+    table = pa.Table.from_pandas(frame)
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def decode(body):
+    return freeze(pa.ipc.open_stream(body).read_all().to_pandas())
+
+
+class Answer:
+    """캐시된 질의 결과: 읽기 전용 DataFrame과 ETag (HTTP 본문은 처음 요청될 때 한 번만 만듦)."""
+
+    def __init__(self, frame, tag):
+        self.frame = frame
+        self.etag = tag
+        self._body = None
+
+    @property
+    def body(self):
+        if self._body is None:
+            self._body = encode(self.frame)
+        return self._body
+
+
+@st.cache_resource(max_entries=1024, show_spinner=False)
+def _answer(name, params, data_version):
+    frame = QUERIES[name](**dict(params))
+    return Answer(freeze(frame), etag(name, params, data_version))
+
+
+def answer(name, params, data_version=None):
+    """검사한 인자(resolve 결과)로 캐시된 결과를 꺼내거나 만든다."""
+    return _answer(name, params, version(name) if data_version is None else data_version)
+
+
+# ---- 클라이언트 -------------------------------------------------------------------
+
+# (질의, 인자) -> (ETag, DataFrame): 서버가 304를 주면 그대로 사용
+MAX_REMOTE = 512
+_remote = OrderedDict()
+_remote_lock = threading.Lock()
+
+
+def _fetch_remote(name, params):
+    key = (name, tuple(sorted((k, str(v)) for k, v in params.items())))
+    url = f"{URL.rstrip('/')}/query/{name}?{urllib.parse.urlencode(key[1])}"
+    request = urllib.request.Request(url)
+    with _remote_lock:
+        cached = _remote.get(key)
+    if cached is not None:
+        request.add_header('If-None-Match', cached[0])
+    try:
+        with urllib.request.urlopen(request, timeout=TIMEOUT) as response:
+            result = (response.headers['ETag'], decode(response.read()))
+    except urllib.error.HTTPError as error:
+        if error.code == 304 and cached is not None:
+            return cached[1]
+        if error.code in (400, 404):
+            raise QueryError(json.loads(error.read())['error']) from None
+        raise
+    with _remote_lock:
+        _remote[key] = result
+        _remote.move_to_end(key)
+        while len(_remote) > MAX_REMOTE:
+            _remote.popitem(last=False)
+    return result[1]
+
+
+def fetch(name, **params):
+    """질의 결과 (읽기 전용 DataFrame). DASHBOARD_QUERY_URL이 있으면 그 서비스에 묻는다."""
+    with instrument.span(name, 'query'):
+        if URL:
+            return _fetch_remote(name, params)
+        # 파일 버전은 한 번만 확인해 인자 검사와 결과 캐시에 함께 씀
+        data_version = version(name)
+        return answer(name, resolve(name, params, data_version), data_version).frame
+
+
+def values(name, column, **params):
+    """질의 결과의 한 열을 목록으로 (위젯 선택지 등)."""
+    return fetch(name, **params)[column].tolist()
+
+
+# ---- HTTP 서버 --------------------------------------------------------------------
+
+def describe():
+    """질의 목록: 이름 -> 데이터 파일, 인자별 선택지."""
+    return {
+        name: {'data': list(func.data), 'params': {key: list(map(str, options())) for key, options in func.params.items()}}
+        for name, func in QUERIES.items()
+    }
+
+
+class Handler(BaseHTTPRequestHandler):
+    """GET /queries (질의 목록, JSON), GET /query/<이름>?인자=값 (Arrow IPC, ETag)."""
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        if url.path == '/queries':
+            return self._send(200, json.dumps(describe(), ensure_ascii=False).encode(), 'application/json')
+        name = url.path.removeprefix('/query/')
+        if name == url.path or name not in QUERIES:
+            return self._error(404, f'모르는 질의: {url.path}')
+        data_version = version(name)
+        try:
+            params = resolve(name, dict(urllib.parse.parse_qsl(url.query)), data_version)
+        except QueryError as error:
+            return self._error(400, str(error))
+        tag = etag(name, params, data_version)
+        if tag in self.headers.get('If-None-Match', ''):
+            return self._send(304, b'', None, tag)
+        result = answer(name, params, data_version)
+        self._send(200, result.body, CONTENT_TYPE, result.etag)
+
+    def _error(self, status, message):
+        self._send(status, json.dumps({'error': message}, ensure_ascii=False).encode(), 'application/json')
+
+    def _send(self, status, body, content_type, tag=None):
+        self.send_response(status)
+        if tag is not None:
+            self.send_header('ETag', tag)
+            # 매번 ETag로 확인 (데이터가 바뀌면 ETag도 바뀜)
+            self.send_header('Cache-Control', 'no-cache')
+        if content_type is not None:
+            self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(host='127.0.0.1', port=8765):
+    server = ThreadingHTTPServer((host, port), Handler)
+    print(f'query service on http://{host}:{server.server_port} ({len(QUERIES)} queries)', flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='대시보드 질의 서비스 (HTTP)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--warm', action='store_true', help='시작 전에 모든 질의/인자 조합을 미리 계산')
+    args = parser.parse_args()
+
+    if args.warm:
+        for name, func in QUERIES.items():
+            keys = list(func.params)
+            combos = [()]
+            for key in keys:
+                combos = [combo + (choice,) for combo in combos for choice in func.params[key]()]
+            for combo in combos:
+                answer(name, resolve(name, dict(zip(keys, combo)))).body
+    serve(args.host, args.port)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
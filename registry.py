@@ -0,0 +1,51 @@
+"""모든 페이지와 세션이 공유하는 프로세스 단위 리소스.
+
+페이지마다 따로 만들던 것(지역 좌표표, 좌표를 붙인 데이터)을 한곳에 모았다.
+데이터셋(data_loader), GeoJSON(choropleth), 렌더링된 그림(figure_cache)도
+모두 `st.cache_resource`로 프로세스에 하나씩만 있으므로, 페이지나 세션이 늘어도
+메모리는 데이터 크기만큼만 쓴다.
+"""
+import pandas as pd
+import streamlit as st
+
+from data_loader import freeze, load_table, table_version
+
+# 지도 표시용 위도/경도 (수동 입력)
+LOCATIONS = {
+    # 시도 (app1 임대료 지도)
+    'provinces': {
+        '지역': ['강원', '경기', '경남', '경북', '광주', '대구', '대전', '부산', '서울', '세종',
+                '울산', '인천', '전남', '전북', '제주', '충남', '충북'],
+        'lat': [37.5559, 37.2751, 35.2375, 36.2486, 35.1600, 35.8714, 36.3510, 35.1796, 37.5665, 36.4803,
+                35.5384, 37.4563, 34.8194, 35.8232, 33.4996, 36.5184, 36.6355],
+        'lon': [128.2093, 127.0095, 128.6925, 128.8566, 126.8514, 128.6014, 127.3845, 129.0756, 126.9780, 127.2890,
+                129.3115, 126.7052, 126.4630, 127.1477, 126.5312, 126.8009, 127.4913],
+    },
+    # 서울 자치구 (app2 종사자 지도)
+    'districts': {
+        '지역': ['종로구', '중구', '용산구', '성동구', '광진구', '동대문구', '중랑구', '성북구', '강북구', '도봉구', '노원구', '은평구',
+                '서대문구', '마포구', '양천구', '강서구', '구로구', '금천구', '영등포구', '동작구', '관악구', '서초구', '강남구', '송파구', '강동구'],
+        'lat': [37.5723, 37.5642, 37.5313, 37.5668, 37.5397, 37.5745, 37.5940, 37.5892, 37.6371, 37.6535, 37.6549, 37.6066,
+                37.5712, 37.5492, 37.5125, 37.5482, 37.4865, 37.4707, 37.5201, 37.5097, 37.4817, 37.4958, 37.4979, 37.5017, 37.5541],
+        'lon': [126.9796, 126.9977, 126.9654, 127.0385, 127.0723, 127.0378, 127.0720, 127.0226, 127.0354, 127.0360, 127.0564, 126.9249,
+                126.9316, 126.9316, 126.8793, 126.8491, 126.8745, 126.8831, 126.9061, 126.9365, 126.9512, 127.0310, 127.0292, 127.1059, 127.1231],
+    },
+}
+
+@st.cache_resource(show_spinner=False)
+def locations(name):
+    """지역 좌표표 (읽기 전용)."""
+    return freeze(pd.DataFrame(LOCATIONS[name]))
+
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _located(name, places, version):
+    df = load_table(name)
+    # 첫 열이 지역명 (파일에 따라 'Unnamed: 0'으로 들어옴)
+    df = df.rename(columns={df.columns[0]: '지역'})
+    return freeze(pd.merge(df, locations(places), on='지역'))
+
+
+def located(name, places):
+    """데이터셋에 지역 좌표(lat, lon)를 붙인 표. 세션마다 다시 병합하지 않는다."""
+    return _located(name, places, table_version(name))
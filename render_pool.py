@@ -0,0 +1,153 @@
+"""서로 독립적인 차트를 프로세스 풀에서 동시에 그린다 (선택 기능).
+
+    DASHBOARD_RENDER_WORKERS=4 streamlit run streamlit_app.py
+
+켜져 있으면 `figure_cache.show`가 캐시에 없는 이미지/HTML 차트를 바로 그리지 않고
+자리(st.empty)만 잡은 뒤 풀에 넘기며, 페이지 끝의 `flush()`가 끝나는 순서대로 채운다.
+페이지 전체가 뜨는 시간이 차트 시간의 합 대신 가장 느린 차트 하나 정도가 된다.
+
+- 풀은 프로세스에 하나만 만들어 모든 세션과 재실행이 같이 쓴다.
+- 워커는 spawn으로 시작하되, Streamlit에서는 `__main__`이 페이지 스크립트라 워커가 그것을 다시
+  실행하지 않도록 워커를 띄우는 동안만 빈 `__main__`으로 바꿔 둔다 (_WorkerProcess).
+- 워커는 chart_id와 인자만 받아 charts 패키지의 빌더로 직접 그리고 PNG bytes나 HTML을 돌려준다.
+  데이터는 워커가 직접 읽어 자기 프로세스 안에 캐시한다.
+- plotly 지도는 이미 만들어 둔 Figure 객체를 캐시에서 꺼내 쓰므로 풀에 보내지 않는다.
+- 워커가 죽는 등 풀이 망가지면 풀을 버리고 그 자리에서 그린다.
+"""
+import multiprocessing
+import os
+import sys
+import threading
+import types
+from multiprocessing.context import SpawnContext
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+import instrument
+
+WORKERS = int(os.environ.get('DASHBOARD_RENDER_WORKERS') or 0)
+
+# 풀에 보내는 출력 종류 (charts.base.OUTPUTS 중)
+POOL_OUTPUTS = ('image', 'html')
+
+_local = threading.local()
+_main_lock = threading.Lock()
+
+
+def enabled():
+    return WORKERS > 0
+
+
+def _init_worker(path):
+    # spawn된 워커는 앱 폴더를 모르므로 경로를 넘겨 받음
+    sys.path.insert(0, path)
+    import matplotlib
+    matplotlib.use('Agg')
+
+    import fonts
+    fonts.setup()
+
+
+def render_chart(chart_id, args, fmt='png'):
+    """워커에서 실행: 빌더로 그림을 만들어 전송 가능한 값(PNG bytes, HTML str)으로 돌려준다."""
+    import charts
+    import figure_cache
+
+    chart = charts.CHARTS[chart_id]
+    if chart.output == 'image':
+        return figure_cache.render(chart(*args), fmt)
+    return chart(*args)
+
+
+class _WorkerProcess(multiprocessing.get_context('spawn').Process):
+    """spawn 워커. 시작할 때 `__main__`(페이지 스크립트)의 경로를 넘기지 않는다.
+
+    spawn은 자식에서 부모의 `__main__` 파일을 다시 import하는데, Streamlit 실행 중에는 그것이
+    app1.py 같은 페이지라 워커마다 페이지 전체가 실행되고 실패한다.
+    """
+
+    def start(self):
+        with _main_lock:
+            main = sys.modules['__main__']
+            sys.modules['__main__'] = types.ModuleType('__main__')
+            try:
+                super().start()
+            finally:
+                sys.modules['__main__'] = main
+
+
+class _WorkerContext(SpawnContext):
+    Process = _WorkerProcess
+
+
+@st.cache_resource(show_spinner=False)
+def _executor(workers):
+    # 스레드가 많은 서버 프로세스를 fork하지 않도록 spawn 사용
+    from data_loader import BASE_DIR
+
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=_WorkerContext(),
+        initializer=_init_worker,
+        initargs=(str(BASE_DIR),),
+    )
+
+
+def _pending():
+    # 재실행이 중간에 끊기면 이전 실행의 자리는 없어지므로, 실행이 바뀌면(ctx.cursors 교체) 남은 작업을 버림
+    ctx = get_script_run_ctx()
+    run = ctx.cursors if ctx else None
+    if not hasattr(_local, 'jobs'):
+        # 이 스레드의 첫 호출 (Streamlit 밖이면 run이 None이라 아래 비교로는 초기화되지 않음)
+        _local.run = run
+        _local.jobs = []
+    if _local.run is not run:
+        for future, *_ in _local.jobs:
+            future.cancel()
+        _local.run = run
+        _local.jobs = []
+    return _local.jobs
+
+
+def submit(chart, args, cache_key, display):
+    """풀에 차트 하나를 넘긴다. 풀을 쓰지 않는 경우 False를 반환하며 호출한 쪽이 바로 그린다.
+
+    display(value)는 결과가 도착하면 자리(placeholder)에 내용을 채우는 함수다.
+    """
+    if not enabled() or chart.output not in POOL_OUTPUTS:
+        return False
+    try:
+        future = _executor(WORKERS).submit(render_chart, chart.chart_id, args)
+    except (BrokenProcessPool, RuntimeError):
+        _executor.clear()
+        return False
+    _pending().append((future, chart, args, cache_key, display))
+    return True
+
+
+def flush():
+    """이번 실행에서 넘긴 차트를 끝나는 순서대로 자리에 채운다. 페이지 끝에서 호출."""
+    jobs = _pending()
+    if not jobs:
+        return
+    _local.jobs = []
+    import figure_cache
+
+    cache = figure_cache.get_cache()
+    by_future = {job[0]: job for job in jobs}
+    with instrument.span('render_pool', 'render'):
+        for future in as_completed(by_future):
+            _, chart, args, cache_key, display = by_future[future]
+            with instrument.span(chart.chart_id, 'render') as span:
+                try:
+                    value = future.result()
+                except BrokenProcessPool:
+                    # 풀이 망가지면 버리고 이 프로세스에서 직접 그림
+                    _executor.clear()
+                    value = render_chart(chart.chart_id, args)
+                cache.put(cache_key, value)
+                span.output_bytes = len(value) if isinstance(value, bytes) else len(value.encode())
+                display(value)
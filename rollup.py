@@ -0,0 +1,146 @@
+import copy
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from data_loader import data_path, incremental, load_table, segment_rows, table_version
+
+logger = logging.getLogger(__name__)
+
+CLOSURE = '폐업률.csv'
+DIMENSIONS = ['년', '분기', '년_분기', '자치구_코드_명', '서비스_업종_코드_명']
+MEASURE = '폐업_률'
+STATS = ['count', 'sum', 'sumsq', '폐업_점포_수']
+
+# 이보다 큰 폐업률 CSV는 통째로 읽지 않고 chunked 로더로 나눠 읽으며 집계 (MB)
+STREAM_MB = float(os.environ.get('DASHBOARD_STREAM_MB') or 64)
+
+# 미리 계산해 두는 집계 단위 (차트에서 쓰는 것)
+ROLLUPS = [('년',), ('분기',), ('년_분기',), ('자치구_코드_명', '년_분기')]
+
+# 95% 신뢰구간 (정규 근사)
+Z_95 = 1.959964
+
+
+def _stats(df, by):
+    # 합칠 수 있는 통계(개수, 합, 제곱합)만 저장해 두면 행이 추가돼도 더하기만 하면 됨
+    values = df[MEASURE].astype('float64')
+    frame = pd.DataFrame({
+        'count': 1,
+        'sum': values,
+        'sumsq': values * values,
+        '폐업_점포_수': df['폐업_점포_수'],
+    })
+    for column in by:
+        frame[column] = df[column].astype(object) if isinstance(df[column].dtype, pd.CategoricalDtype) else df[column]
+    return frame.groupby(list(by), sort=True).sum()
+
+
+def _add(stats, more):
+    # add(fill_value=0)는 새로 생긴 행 때문에 정수 열(count 등)을 float으로 바꾸므로 원래 형식으로 되돌림
+    total = stats.add(more, fill_value=0)
+    return total.astype(stats.dtypes.to_dict())
+
+
+def _finish(stats):
+    # 합계 통계 -> 평균, 표준편차, 신뢰구간
+    count = stats['count']
+    mean = stats['sum'] / count
+    variance = (stats['sumsq'] - count * mean * mean) / (count - 1).where(count > 1)
+    sem = np.sqrt(variance.clip(lower=0)) / np.sqrt(count)
+    result = stats.copy()
+    result['mean'] = mean
+    result['ci_low'] = mean - Z_95 * sem
+    result['ci_high'] = mean + Z_95 * sem
+    return result
+
+
+class ClosureCube:
+    """폐업률 데이터를 (년, 분기, 년_분기, 자치구, 업종) 단위로 집계한 큐브.
+
+    각 집계 단위마다 개수/합/제곱합과 평균, 95% 신뢰구간을 보관한다.
+    새 분기 행이 들어오면 그 행들만 집계해 기존 값에 더한다.
+    """
+
+    def __init__(self, df):
+        self.cells = _stats(df, DIMENSIONS)
+        self._stats = {by: _stats(df, by) for by in ROLLUPS}
+        self._rollups = {by: _finish(stats) for by, stats in self._stats.items()}
+
+    @classmethod
+    def from_stats(cls, stats):
+        """집계 단위별로 이미 합계한 통계({by: STATS 열 표})로 만든다 (chunked 로더용).
+
+        셀 단위 통계가 없으므로 미리 집계하지 않은 단위는 rollup()에서 KeyError.
+        """
+        cube = cls.__new__(cls)
+        cube.cells = None
+        cube._stats = dict(stats)
+        cube._rollups = {by: _finish(stats) for by, stats in cube._stats.items()}
+        return cube
+
+    def rollup(self, *by):
+        if by not in self._rollups:
+            if self.cells is None:
+                raise KeyError(f'미리 집계하지 않은 단위: {by}')
+            stats = self.cells.groupby(list(by), sort=True)[STATS].sum()
+            self._stats[by] = stats
+            self._rollups[by] = _finish(stats)
+        return self._rollups[by]
+
+    def append(self, rows):
+        """새로 들어온 행만 집계해 기존 큐브에 더한다 (전체 재계산 없음).
+
+        속성을 새 객체로 바꿔 끼우기만 하므로 copy.copy(cube).append(rows)는 원래 큐브를 건드리지 않는다.
+        """
+        if self.cells is not None:
+            self.cells = _add(self.cells, _stats(rows, DIMENSIONS))
+        self._stats = {by: _add(stats, _stats(rows, by)) for by, stats in self._stats.items()}
+        self._rollups = {by: _finish(stats) for by, stats in self._stats.items()}
+        return self
+
+
+def _build_cube():
+    path = data_path(CLOSURE)
+    if os.path.getsize(path) <= STREAM_MB * 1024 * 1024:
+        return ClosureCube(load_table(CLOSURE))
+    import chunked
+
+    try:
+        result = chunked.load(path)
+    except MemoryError as error:
+        # 페이지가 실패하지 않도록 가장 작은 청크로 상한 없이 한 번 더 (느리지만 원본 행은 여전히 한 청크만)
+        logger.warning('closure cube over loader budget, retrying without limit: %s', error)
+        result = chunked.load(path, max_mb=None, chunk_rows=chunked.MIN_CHUNK_ROWS)
+    logger.info('closure cube streamed: %s', result.report())
+    # 청크 로더는 CSV만 읽으므로 ingest.py로 추가된 분기는 따로 더함
+    rows = segment_rows(CLOSURE, [label for label, *_ in table_version(CLOSURE)[1]])
+    return result.cube if rows is None else result.cube.append(rows)
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _closure_cube(version):
+    # 새 분기가 추가되면 직전 큐브에 그 분기 행만 더함
+    return incremental('closure_cube', CLOSURE, version, _build_cube,
+                       lambda cube, rows: copy.copy(cube).append(rows))
+
+
+def closure_cube():
+    return _closure_cube(table_version(CLOSURE))
+
+
+def district_rate(district):
+    """자치구의 년_분기별 평균 폐업률 (큐브의 자치구/분기 집계, 정렬된 인덱스에서 슬라이스)."""
+    return closure_cube().rollup('자치구_코드_명', '년_분기')['mean'].loc[district].rename(MEASURE)
+
+
+def plot_mean(ax, rollup, **kwargs):
+    """seaborn lineplot(평균 + 95% 신뢰구간 띠)과 같은 모양을 큐브 값으로 그린다."""
+    line, = ax.plot(rollup.index, rollup['mean'], **kwargs)
+    ax.fill_between(rollup.index, rollup['ci_low'], rollup['ci_high'], color=line.get_color(), alpha=0.2, linewidth=0)
+    ax.set_xlabel(rollup.index.name)
+    ax.set_ylabel(MEASURE)
+    return line
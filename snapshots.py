@@ -0,0 +1,152 @@
+"""CSV 데이터를 정제된 Arrow 스냅샷으로 미리 변환한다.
+
+    python snapshots.py            # 모든 CSV의 스냅샷 생성 (바뀐 파일만)
+    python snapshots.py --force    # 전부 다시 생성
+    python snapshots.py --check    # 오래된 스냅샷 목록만 출력
+
+스냅샷에는 원본 CSV의 (정제 형식, 수정시각, 크기)가 기록되어 있어 CSV가 바뀌면
+자동으로 무시되고 CSV를 다시 읽는다.
+
+ingest.py로 추가한 분기 행은 CSV를 고치지 않고 snapshots/<이름>.segments/<년_분기>.arrow
+세그먼트로 쌓인다. 세그먼트에도 원본 CSV 버전이 기록되어 CSV가 바뀌면 무시된다.
+"""
+import argparse
+import os
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+
+from cleaning import READ_OPTIONS, clean
+
+BASE_DIR = Path(__file__).resolve().parent
+SNAPSHOT_DIR = BASE_DIR / 'snapshots'
+
+# 정제 방식(cleaning.clean)이 바뀌면 올려서 기존 스냅샷을 무효화
+SNAPSHOT_FORMAT = 2
+
+
+def source_version(csv_path):
+    stat = os.stat(csv_path)
+    return f'{SNAPSHOT_FORMAT}:{stat.st_mtime_ns}:{stat.st_size}'
+
+
+def snapshot_path(csv_path):
+    return SNAPSHOT_DIR / (Path(csv_path).stem + '.arrow')
+
+
+def read_csv(csv_path):
+    return clean(pd.read_csv(csv_path, **READ_OPTIONS))
+
+
+def write_snapshot(csv_path):
+    df = read_csv(csv_path)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[b'source_version'] = source_version(csv_path).encode()
+    table = table.replace_schema_metadata(metadata)
+
+    SNAPSHOT_DIR.mkdir(exist_ok=True)
+    path = snapshot_path(csv_path)
+    tmp_path = path.with_suffix('.tmp')
+    # 메모리 매핑이 가능하도록 압축하지 않은 Arrow IPC 파일로 저장
+    with pa.OSFile(str(tmp_path), 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+    return path
+
+
+def is_fresh(csv_path):
+    path = snapshot_path(csv_path)
+    if not path.exists():
+        return False
+    with pa.memory_map(str(path)) as source:
+        metadata = pa.ipc.open_file(source).schema.metadata or {}
+    return metadata.get(b'source_version') == source_version(csv_path).encode()
+
+
+def read_snapshot(csv_path):
+    """스냅샷이 최신이면 메모리 매핑으로 읽어 반환하고, 아니면 None."""
+    path = snapshot_path(csv_path)
+    if not path.exists():
+        return None
+    source = pa.memory_map(str(path))
+    reader = pa.ipc.open_file(source)
+    metadata = reader.schema.metadata or {}
+    if metadata.get(b'source_version') != source_version(csv_path).encode():
+        return None
+    # split_blocks: 결측 없는 숫자 열은 매핑된 버퍼를 복사 없이 사용
+    return reader.read_all().to_pandas(split_blocks=True)
+
+
+def segment_dir(csv_path):
+    return SNAPSHOT_DIR / (Path(csv_path).stem + '.segments')
+
+
+def segment_versions(csv_path):
+    """추가된 세그먼트의 (이름, 수정시각, 크기) 목록 (이름 순 = 분기 순)."""
+    try:
+        entries = list(os.scandir(segment_dir(csv_path)))
+    except FileNotFoundError:
+        return ()
+    versions = []
+    for entry in entries:
+        if entry.name.endswith('.arrow'):
+            stat = entry.stat()
+            versions.append((entry.name[:-len('.arrow')], stat.st_mtime_ns, stat.st_size))
+    return tuple(sorted(versions))
+
+
+def write_segment(csv_path, label, df):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[b'source_version'] = source_version(csv_path).encode()
+    table = table.replace_schema_metadata(metadata)
+
+    directory = segment_dir(csv_path)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f'{label}.arrow'
+    tmp_path = path.with_suffix('.tmp')
+    with pa.OSFile(str(tmp_path), 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_segment(csv_path, label):
+    """세그먼트가 지금 CSV에 덧붙인 것이면 DataFrame을, 아니면(CSV가 바뀜) None을 반환한다."""
+    # 세그먼트는 작으므로 메모리 매핑 없이 읽음 (삭제돼도 영향 없도록)
+    with pa.OSFile(str(segment_dir(csv_path) / f'{label}.arrow'), 'rb') as source:
+        reader = pa.ipc.open_file(source)
+        metadata = reader.schema.metadata or {}
+        if metadata.get(b'source_version') != source_version(csv_path).encode():
+            return None
+        return reader.read_all().to_pandas()
+
+
+def csv_files():
+    return sorted(BASE_DIR.glob('*.csv'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CSV -> Arrow 스냅샷 생성')
+    parser.add_argument('names', nargs='*', help='변환할 CSV 파일 (기본: 전체)')
+    parser.add_argument('--force', action='store_true', help='최신 스냅샷도 다시 생성')
+    parser.add_argument('--check', action='store_true', help='오래된 스냅샷만 출력')
+    args = parser.parse_args()
+
+    paths = [BASE_DIR / name for name in args.names] or csv_files()
+    stale = [path for path in paths if args.force or not is_fresh(path)]
+    if args.check:
+        for path in stale:
+            print(f'stale: {path.name}')
+        return 1 if stale else 0
+    for path in stale:
+        print(f'{path.name} -> {write_snapshot(path).relative_to(BASE_DIR)}')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
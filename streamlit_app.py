@@ -0,0 +1,21 @@
+import streamlit as st
+
+import warmup
+
+# 세 페이지를 하나의 앱(프로세스)으로 실행: 데이터, GeoJSON, 그림 캐시는 registry를 통해 공유
+#   streamlit run streamlit_app.py
+# 각 페이지 파일은 지금처럼 단독으로도 실행할 수 있다 (streamlit run app1.py)
+PAGES = [
+    st.Page('app1.py', title='소비 및 지출환경 분석', icon='💵', default=True),
+    st.Page('app2.py', title='지역 경제 및 생산성', icon='💵'),
+    st.Page('app3.py', title='인구 및 사업환경', icon='💵'),
+]
+
+# DASHBOARD_WARMUP=1이면 첫 실행 때 모든 위젯 값의 차트를 백그라운드에서 미리 그림 (프로세스당 한 번)
+progress = warmup.start()
+
+st.navigation(PAGES).run()
+
+# 페이지가 set_page_config를 먼저 호출해야 하므로 진행 상황은 페이지 뒤에 표시
+if progress is not None and not progress.finished:
+    st.sidebar.caption(progress.text())
@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+# 앱 모듈(data_loader, charts 등)은 저장소 최상위에 있음
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
@@ -0,0 +1,22 @@
+"""app3.py를 두 번 실행해 데이터 파일을 프로세스당 한 번만 읽는지 확인."""
+from streamlit.testing.v1 import AppTest
+
+import data_loader
+
+# app3이 읽는 데이터 파일
+FILES = ['폐업률.csv', '폐업_률.csv', '폐업_점포_수.csv', '구별_연도별_프랜차이즈.csv', '서울시 동별 인구밀도.csv']
+
+
+def test_app3_reads_each_file_once():
+    app = AppTest.from_file(str(data_loader.BASE_DIR / 'app3.py'), default_timeout=180)
+    app.run()
+    assert not app.exception
+    first = dict(data_loader.read_counts)
+    for name in FILES:
+        assert first.get(str(data_loader.data_path(name))) == 1, name
+    # 캐시 적중은 세지 않으므로 어떤 파일이든 두 번 읽혔으면 캐시가 깨진 것
+    assert all(count == 1 for count in first.values()), first
+
+    app.run()
+    assert not app.exception
+    assert dict(data_loader.read_counts) == first
@@ -0,0 +1,24 @@
+"""큰 폐업률 CSV를 나눠 읽는 설정(STREAM_MB=0)에서 app3이 폐업률.csv를 통째로 읽지 않는지 확인."""
+from streamlit.testing.v1 import AppTest
+
+import data_loader
+import figure_cache
+import query
+import rollup
+
+
+def test_app3_streams_closure_csv(monkeypatch):
+    monkeypatch.setattr(rollup, 'STREAM_MB', 0)
+    # 앞선 테스트가 채운 캐시를 비워 폐업률.csv를 쓰는 경로가 모두 다시 실행되도록
+    for cache in (data_loader._read_table, data_loader._read_segments, rollup._closure_cube,
+                  query._answer, query._choices, figure_cache.get_cache):
+        cache.clear()
+    data_loader._latest.clear()
+    path = str(data_loader.data_path(rollup.CLOSURE))
+    before = data_loader.read_counts[path]
+
+    app = AppTest.from_file(str(data_loader.BASE_DIR / 'app3.py'), default_timeout=180)
+    app.run()
+    assert not app.exception
+    assert rollup.closure_cube().cells is None  # chunked 로더로 만든 큐브
+    assert data_loader.read_counts[path] == before
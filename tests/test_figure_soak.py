@@ -0,0 +1,40 @@
+"""그림을 수백 번 그리고 정리해도 FigureCache 한도와 살아 있는 Figure 수가 유지되는지 확인
+(benchmarks/soak_figures.py의 짧은 버전)."""
+import gc
+import itertools
+import sys
+
+import figure_cache
+
+CYCLES = 300
+SIZES = [(1, 1), (2, 1), (1, 2)]
+
+
+def live_figures():
+    from matplotlib.figure import Figure
+    gc.collect()
+    return sum(isinstance(obj, Figure) for obj in gc.get_objects())
+
+
+def draw(i, figsize):
+    fig, ax = figure_cache.figure(figsize)
+    ax.plot(range(10), [(i * j) % 7 for j in range(10)])
+    ax.set_title(f'{i}')
+    return fig
+
+
+def test_render_release_cycles_stay_bounded():
+    cache = figure_cache.FigureCache(max_bytes=256 * 1024, max_entries=16)
+    baseline = None
+    for i, figsize in zip(range(CYCLES), itertools.cycle(SIZES)):
+        cache.put(('soak', i), figure_cache.render(draw(i, figsize)))
+        assert cache.total_bytes <= cache.max_bytes
+        assert len(cache) <= cache.max_entries
+        if i == len(SIZES) * 2:
+            # 크기별 재사용 Figure가 채워진 뒤를 기준으로
+            baseline = live_figures()
+
+    assert live_figures() <= baseline
+    assert all(len(spare) <= figure_cache.SPARE_FIGURES for spare in figure_cache._spare_figures.values())
+    pyplot = sys.modules.get('matplotlib.pyplot')
+    assert pyplot is None or not pyplot.get_fignums()
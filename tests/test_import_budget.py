@@ -0,0 +1,13 @@
+"""페이지 import가 그리기 라이브러리를 끌어오지 않고 시간 예산 안에 끝나는지 확인 (benchmarks/import_profile.py)."""
+from benchmarks import import_profile
+
+
+def test_page_imports_are_lazy():
+    _, loaded = import_profile.measure(import_profile.STARTUP_MODULES, repeat=1)
+    eager = [name for name in import_profile.LAZY_MODULES if name in loaded]
+    assert not eager, f'페이지 import에 끌려온 모듈: {eager}'
+
+
+def test_page_imports_within_budget():
+    ms, _ = import_profile.measure(import_profile.STARTUP_MODULES)
+    assert ms <= import_profile.STARTUP_BUDGET_MS
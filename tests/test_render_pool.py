@@ -0,0 +1,29 @@
+"""렌더 풀을 켠 채 페이지를 실행해 이미지가 풀의 워커에서 그려지는지 확인 (이 프로세스로 대신 그리지 않음)."""
+from streamlit.testing.v1 import AppTest
+
+import charts.base
+import data_loader
+import figure_cache
+import render_pool
+
+
+def test_page_images_come_from_pool(monkeypatch):
+    monkeypatch.setattr(render_pool, 'WORKERS', 2)
+    # 이미지 차트가 풀로 가도록 matplotlib 버전 선택
+    monkeypatch.setattr(charts.base, 'BACKEND', 'matplotlib')
+    monkeypatch.setattr(charts.base, 'BACKENDS', {})
+    local = []
+    render = figure_cache.render
+    monkeypatch.setattr(figure_cache, 'render', lambda *args, **kwargs: local.append(args) or render(*args, **kwargs))
+    figure_cache.get_cache.clear()
+
+    app = AppTest.from_file(str(data_loader.BASE_DIR / 'app1.py'), default_timeout=300)
+    try:
+        app.run()
+    finally:
+        render_pool._executor(2).shutdown()
+        render_pool._executor.clear()
+    assert not app.exception
+    assert len(app.get('imgs')) == 3
+    # 풀이 망가져 flush가 이 프로세스에서 다시 그렸다면 render가 불렸을 것
+    assert not local
@@ -0,0 +1,141 @@
+"""모든 위젯 값 조합의 차트를 미리 그려 캐시를 채운다.
+
+    DASHBOARD_WARMUP=1 streamlit run streamlit_app.py   # 서버 프로세스 안에서 백그라운드로
+    python warmup.py                                    # 전체 조합을 한 번 그려 보고 시간/메모리 보고
+
+위젯 선택지는 유한하고 작으므로(지역 17 x 분기 9, 연도 3~4, 분기 22 x 지도 3, 자치구 25 ...)
+charts.CHARTS의 빌더마다 `options`가 돌려주는 값을 모두 넣어 그린다.
+이미지/HTML은 figure_cache에, plotly 지도는 choropleth 캐시에 들어가므로
+이후 사용자가 어떤 값을 골라도 첫 요청부터 캐시에서 바로 나간다.
+
+- 각 위젯의 첫 값(페이지 기본 화면)부터, 그 다음 값 순서로 차트를 번갈아 그린다.
+- 시간 예산(DASHBOARD_WARMUP_SECONDS)이나 메모리 예산(DASHBOARD_WARMUP_MB, 프로세스 최대 RSS)을
+  넘으면 남은 조합은 건너뛴다. 그리지 못한 조합은 평소처럼 처음 요청될 때 그린다.
+- 진행 상황은 `warmup` 로거(INFO)와 사이드바 캡션에 표시된다.
+"""
+import argparse
+import logging
+import os
+import threading
+import time
+from itertools import zip_longest
+
+import streamlit as st
+
+import charts
+import figure_cache
+import instrument
+
+logger = logging.getLogger(__name__)
+
+ENABLED = os.environ.get('DASHBOARD_WARMUP') == '1'
+BUDGET_SECONDS = float(os.environ.get('DASHBOARD_WARMUP_SECONDS') or 600)
+BUDGET_MB = float(os.environ.get('DASHBOARD_WARMUP_MB') or 1536)
+
+
+def jobs():
+    """(빌더, 인자) 목록. 위젯 선택지 순서가 같은 것끼리 모아 기본 화면부터 채운다."""
+    per_chart = [[(build, args) for args in charts.states(build)] for build in charts.CHARTS.values()]
+    return [job for row in zip_longest(*per_chart) for job in row if job is not None]
+
+
+def prepare(build, args):
+    """figure_cache.show가 쓰는 것과 같은 캐시에 결과를 넣는다."""
+    build = build.select()
+    if build.output == 'image':
+        return figure_cache.cached_figure(build.chart_id, lambda: build(*args), args, build.data)
+    if build.output == 'html':
+        return figure_cache.cached(build.chart_id, lambda: build(*args), args, build.data)
+    # plotly 지도는 choropleth 모듈이 Figure 객체를 캐시 (Altair 차트는 만들기만 해 데이터를 읽어 둠)
+    return build(*args)
+
+
+class Progress:
+    def __init__(self, total):
+        self.total = total
+        self.done = 0
+        self.current = None
+        self.stopped = None
+        self.finished = False
+        self.started = time.perf_counter()
+        self.seconds = 0.0
+
+    def text(self):
+        state = '완료' if self.finished else f'진행 중 ({self.current})'
+        line = f'미리 그리기 {state}: {self.done}/{self.total}, {self.seconds:.1f}초'
+        if self.stopped:
+            line += f', 중단: {self.stopped}'
+        return line
+
+
+def run(budget_seconds=BUDGET_SECONDS, budget_mb=BUDGET_MB, progress=None):
+    """모든 조합을 예산 안에서 그린다. 진행 상황 객체(Progress)를 반환한다."""
+    todo = jobs()
+    progress = progress or Progress(len(todo))
+    progress.total = len(todo)
+    for build, args in todo:
+        progress.seconds = time.perf_counter() - progress.started
+        rss = instrument.peak_rss_mb()
+        if progress.seconds > budget_seconds:
+            progress.stopped = f'시간 예산 {budget_seconds:.0f}초 초과'
+        elif rss is not None and rss > budget_mb:
+            progress.stopped = f'메모리 예산 {budget_mb:.0f}MB 초과 (최대 RSS {rss:.0f}MB)'
+        if progress.stopped:
+            logger.warning('warmup stopped: %s', progress.stopped)
+            break
+        progress.current = f"{build.chart_id}({', '.join(map(str, args))})"
+        with instrument.span(build.chart_id, 'warmup'):
+            prepare(build, args)
+        progress.done += 1
+        logger.info('warmup %d/%d %s', progress.done, progress.total, progress.current)
+    progress.seconds = time.perf_counter() - progress.started
+    progress.current = None
+    progress.finished = True
+    return progress
+
+
+def _run_quietly(progress):
+    try:
+        run(progress=progress)
+    except Exception:
+        # 미리 그리기가 실패해도 서버는 평소처럼 동작 (요청 시 그림)
+        logger.exception('warmup failed')
+        progress.stopped = '오류'
+        progress.finished = True
+
+
+@st.cache_resource(show_spinner=False)
+def _start():
+    progress = Progress(0)
+    threading.Thread(target=_run_quietly, args=(progress,), name='warmup', daemon=True).start()
+    return progress
+
+
+def start():
+    """서버 프로세스에서 한 번만 백그라운드 미리 그리기를 시작한다 (DASHBOARD_WARMUP=1일 때)."""
+    if not ENABLED:
+        return None
+    return _start()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='모든 위젯 값 조합의 차트를 미리 그려 시간과 메모리 확인')
+    parser.add_argument('--seconds', type=float, default=BUDGET_SECONDS, help='시간 예산 (초)')
+    parser.add_argument('--mb', type=float, default=BUDGET_MB, help='메모리 예산 (최대 RSS, MB)')
+    args = parser.parse_args()
+
+    import matplotlib
+    matplotlib.use('Agg')
+    logging.basicConfig(format='%(message)s')
+    logger.setLevel(logging.INFO)
+    progress = run(args.seconds, args.mb)
+    cache = figure_cache.get_cache()
+    rss = instrument.peak_rss_mb()
+    print(progress.text())
+    print(f'figure cache: {len(cache)} items, {cache.total_bytes / 1024 / 1024:.1f}MB'
+          + (f', peak RSS {rss:.0f}MB' if rss is not None else ''))
+    return 1 if progress.stopped else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())